@@ -19,6 +19,20 @@ echo -e "${BLUE}  TaskNotifier Test Runner${NC}"
 echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 echo ""
 
+# pytest is required; pytest-xdist is used when available
+if ! python3 -c "import pytest" &> /dev/null; then
+    echo -e "${RED}[ERROR]${NC} pytest not found. Install with: pip install -r requirements-dev.txt"
+    exit 1
+fi
+
+if python3 -c "import xdist" &> /dev/null; then
+    PYTEST_ARGS=(-n auto --dist loadgroup)
+    echo -e "${GREEN}[INFO]${NC}  Running tests in parallel with pytest-xdist"
+else
+    PYTEST_ARGS=()
+    echo -e "${YELLOW}[WARN]${NC}  pytest-xdist not found, running tests serially. Install with: pip install pytest-xdist"
+fi
+
 # Check if coverage is available
 if command -v coverage &> /dev/null; then
     USE_COVERAGE=true
@@ -36,7 +50,8 @@ echo ""
 if [ "$USE_COVERAGE" = true ]; then
     # Run with coverage
     cd "$SCRIPT_DIR"
-    coverage run --source='scripts' -m unittest discover -s tests -p 'test_*.py' -v
+    # Coverage traces a single process, so skip xdist here
+    coverage run --source='scripts' -m pytest tests -v
     echo ""
     echo -e "${BLUE}[STEP]${NC}  Generating coverage report..."
     echo ""
@@ -48,7 +63,7 @@ if [ "$USE_COVERAGE" = true ]; then
 else
     # Run without coverage
     cd "$SCRIPT_DIR"
-    python3 -m unittest discover -s tests -p 'test_*.py' -v
+    python3 -m pytest tests -v "${PYTEST_ARGS[@]}"
 fi
 
 echo ""
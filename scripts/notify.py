@@ -6,44 +6,130 @@ Zero dependency: Uses only Python standard library
 
 import sys
 import os
-import json
-import platform
-import subprocess
-import urllib.request
-import urllib.parse
-import urllib.error
-from pathlib import Path
+import atexit
+import threading
+import types
+from enum import IntEnum
 
 
 # =============================================================================
 # Constants
 # =============================================================================
 
-# Bark notification configuration per level
-BARK_CONFIG = {
-    "success": {
-        "group": "Claude_Success",
-        "icon": "https://via.placeholder.com/80/4CAF50/FFFFFF?text=✓",
-        "sound": "bell"
-    },
-    "error": {
-        "group": "Claude_Error",
-        "icon": "https://via.placeholder.com/80/F44336/FFFFFF?text=✕",
-        "sound": "alarm"
-    },
-    "info": {
-        "group": "Claude_Info",
-        "icon": "https://via.placeholder.com/80/2196F3/FFFFFF?text=i",
-        "sound": "bell"
-    }
-}
+class Level(IntEnum):
+    """Notification level; values index the per-level tuples below."""
+    SUCCESS = 0
+    ERROR = 1
+    INFO = 2
 
-# Sound files per level (macOS system sounds)
-SOUND_MAP = {
-    "success": "Glass",
-    "error": "Basso",
-    "info": "Ping"
-}
+
+# Level names, as given on the command line and used as config.json icon keys
+LEVEL_NAMES = ("success", "error", "info")
+_LEVELS = {name: Level(index) for index, name in enumerate(LEVEL_NAMES)}
+
+# Default Bark icon and sound per level
+BARK_ICONS = (
+    "https://via.placeholder.com/80/4CAF50/FFFFFF?text=✓",
+    "https://via.placeholder.com/80/F44336/FFFFFF?text=✕",
+    "https://via.placeholder.com/80/2196F3/FFFFFF?text=i"
+)
+BARK_SOUNDS = ("bell", "alarm", "bell")
+
+# Per-level part of the Bark query string (values are already URL-safe)
+_BARK_QS = tuple(f"sound={sound}&level={name}" for name, sound in zip(LEVEL_NAMES, BARK_SOUNDS))
+
+# System notification title per level
+TITLES = ("✅ Task Completed", "❌ Task Failed", "ℹ️ Task Notification")
+
+# Sound per level (macOS system sounds, Windows SystemSounds members)
+MACOS_SOUNDS = ("Glass", "Basso", "Ping")
+WINDOWS_SOUNDS = ("Asterisk", "Hand", "Beep")
+
+
+# Directory containing this script, and the skill root above it
+_SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
+_SKILL_ROOT = os.path.dirname(_SCRIPT_DIR)
+
+# Usage text for bad command lines, built once at import
+_PROG = os.path.basename(__file__)
+_USAGE = (
+    f"Usage: python3 {_PROG} <level> <message>\n"
+    f"       python3 {_PROG} --daemon\n"
+    "\n"
+    "  level:   success | error | info\n"
+    "  message: Notification message (use quotes for spaces)\n"
+    "\n"
+    "Examples:\n"
+    f"  python3 {_PROG} success \"Build completed!\"\n"
+    f"  python3 {_PROG} error \"Tests failed!\"\n"
+    f"  python3 {_PROG} info \"Task in progress...\"\n"
+)
+
+# OS name without importing platform. Matches platform.system() on the three
+# supported OSes; anything else keeps the raw sys.platform (e.g. "freebsd14")
+_SYSTEM = {"darwin": "Darwin", "linux": "Linux", "win32": "Windows"}.get(sys.platform, sys.platform)
+
+# Parsed config.json cache, stored next to config.json
+CONFIG_CACHE_NAME = "config.cache.pkl"
+
+# Per-user directory for state kept between invocations
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "task-notifier"
+)
+
+# Working Linux sound (command, file) pair, remembered across invocations
+LINUX_SOUND_CACHE_PATH = os.path.join(CACHE_DIR, "sound.txt")
+_LINUX_SOUND_CACHE = None
+
+# Most recent notification: 8-byte timestamp + 16-byte (level, message) digest
+DEDUPE_PATH = os.path.join(CACHE_DIR, "dedupe")
+
+# Unix socket the --daemon process listens on
+SOCKET_PATH = os.path.join(os.environ.get("XDG_RUNTIME_DIR") or CACHE_DIR, "task-notifier.sock")
+
+# Persistent Bark connections, keyed on (scheme, netloc)
+_CONN_CACHE = {}
+
+# libnotify handle, loaded on first use (False once loading has failed)
+_LIBNOTIFY = None
+
+# Serializes output from channels running on worker threads
+_PRINT_LOCK = threading.Lock()
+
+
+# =============================================================================
+# Output
+# =============================================================================
+
+def _print(*args, **kwargs):
+    """print() that keeps lines from concurrent channels from interleaving."""
+    with _PRINT_LOCK:
+        print(*args, **kwargs)
+
+
+# =============================================================================
+# Files
+# =============================================================================
+
+def _write_atomic(path, data):
+    """Write bytes to path so concurrent readers never see a partial file.
+
+    Creates the parent directory if needed. On failure the temporary file is
+    removed and the OSError re-raised.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
 
 
 # =============================================================================
@@ -53,16 +139,15 @@ SOUND_MAP = {
 def get_config_path():
     """Get the path to config.json in the skill root directory."""
     # Skill root is the parent of scripts/ directory
-    skill_root = Path(__file__).parent.parent.resolve()
-    return skill_root / "config.json"
+    return os.path.join(_SKILL_ROOT, "config.json")
 
 
 def load_config():
-    """Load configuration from config.json."""
+    """Load configuration from config.json as a normalized namespace."""
     config_path = get_config_path()
 
-    if not config_path.exists():
-        example_path = config_path.parent / "config.example.json"
+    if not os.path.exists(config_path):
+        example_path = os.path.join(os.path.dirname(config_path), "config.example.json")
         print(f"[ERROR] Config file not found: {config_path}", file=sys.stderr)
         print(f"[INFO]  Please copy the example config:", file=sys.stderr)
         print(f"        cp {example_path} {config_path}", file=sys.stderr)
@@ -70,9 +155,8 @@ def load_config():
         sys.exit(1)
 
     try:
-        with open(config_path, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except json.JSONDecodeError as e:
+        return _normalize_config(_load_cached_config(config_path))
+    except ValueError as e:  # json.JSONDecodeError, without importing json up front
         print(f"[ERROR] Invalid JSON in config.json: {e}", file=sys.stderr)
         sys.exit(1)
     except Exception as e:
@@ -80,66 +164,259 @@ def load_config():
         sys.exit(1)
 
 
+def _load_cached_config(config_path):
+    """Load config.json, reusing a pickled copy while the file is unchanged.
+
+    The cache is keyed on (path, mtime_ns, size) of config.json. Any problem
+    with the cache falls back to parsing the JSON file.
+    """
+    stat = os.stat(config_path)
+    cache_key = (str(config_path), stat.st_mtime_ns, stat.st_size)
+    cache_path = os.path.join(os.path.dirname(config_path), CONFIG_CACHE_NAME)
+
+    import pickle
+
+    try:
+        with open(cache_path, "rb") as f:
+            if pickle.load(f) == cache_key:
+                return pickle.load(f)
+    except Exception:
+        pass
+
+    import json
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    try:
+        _write_atomic(
+            cache_path,
+            pickle.dumps(cache_key, pickle.HIGHEST_PROTOCOL) + pickle.dumps(config, pickle.HIGHEST_PROTOCOL)
+        )
+    except OSError:
+        pass
+
+    return config
+
+
+def _normalize_config(raw):
+    """Apply defaults and string cleanup to a raw config dict once."""
+    return types.SimpleNamespace(
+        bark_key=raw.get("bark_key", "").strip(),
+        bark_server=raw.get("bark_server", "https://api.day.app").rstrip("/"),
+        bark_group=raw.get("bark_group", "Claude Code"),
+        icons=raw.get("icons", {}),
+        system_notify_enabled=raw.get("system_notify_enabled", True),
+        sound_enabled=raw.get("sound_enabled", True),
+        dedupe_window_sec=_dedupe_window(raw.get("dedupe_window_sec", 5))
+    )
+
+
+def _dedupe_window(value):
+    """Coerce dedupe_window_sec to seconds, falling back to 5 if it is not a number."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        print(f"[WARN]  dedupe_window_sec must be a number, got {value!r}; using 5", file=sys.stderr)
+        return 5.0
+
+
+# =============================================================================
+# Deduplication
+# =============================================================================
+
+def _is_duplicate(level, message, window):
+    """Check whether the same notification was sent within window seconds.
+
+    If not, this notification is recorded as the most recent one.
+    """
+    import hashlib
+    import struct
+    import time
+
+    key = hashlib.blake2b(f"{LEVEL_NAMES[level]}\0{message}".encode("utf-8"), digest_size=16).digest()
+    now = time.time()
+
+    try:
+        with open(DEDUPE_PATH, "rb") as f:
+            last = f.read(24)
+        if len(last) == 24 and last[8:] == key:
+            (last_time,) = struct.unpack("<d", last[:8])
+            if 0 <= now - last_time < window:
+                return True
+    except OSError:
+        pass
+
+    try:
+        _write_atomic(DEDUPE_PATH, struct.pack("<d", now) + key)
+    except OSError:
+        pass
+
+    return False
+
+
 # =============================================================================
 # Bark Notification
 # =============================================================================
 
 def send_bark_notification(config, level, message):
     """Send push notification via Bark."""
-    bark_key = config.get("bark_key", "").strip()
+    bark_key = config.bark_key
     if not bark_key:
-        print("[WARN]  bark_key is empty, skipping Bark notification", file=sys.stderr)
+        _print("[WARN]  bark_key is empty, skipping Bark notification", file=sys.stderr)
         return False
 
-    bark_server = config.get("bark_server", "https://api.day.app").rstrip("/")
-
-    level_config = BARK_CONFIG.get(level, BARK_CONFIG["info"])
-
     # Get icon URL from config (with fallback to default icons)
-    icon_config = config.get("icons", {})
-    icon_url = icon_config.get(level, icon_config.get("info", level_config["icon"]))
+    icon_config = config.icons
+    icon_url = icon_config.get(LEVEL_NAMES[level], icon_config.get("info", BARK_ICONS[level]))
+
+    import http.client
+    import urllib.parse
 
-    # Build URL parameters
-    params = {
-        "group": config.get("bark_group", "Claude Code"),
-        "sound": level_config["sound"],
-        "level": level.lower()
-    }
+    # Build query string: only group and icon depend on the config
+    query_string = f"group={urllib.parse.quote_plus(config.bark_group)}&{_BARK_QS[level]}"
 
     # Add icon if available
     if icon_url:
-        params["icon"] = icon_url
+        query_string += f"&icon={urllib.parse.quote_plus(icon_url)}"
 
-    # Construct URL
-    url = f"{bark_server}/{bark_key}/{urllib.parse.quote(message)}"
-    query_string = urllib.parse.urlencode(params)
-    full_url = f"{url}?{query_string}"
+    # Construct request path (bark_server may carry a path prefix)
+    parts = urllib.parse.urlsplit(config.bark_server)
+    path = f"{parts.path}/{bark_key}/{urllib.parse.quote(message)}?{query_string}"
 
     try:
-        req = urllib.request.Request(
-            full_url,
-            method="GET",
-            headers={"User-Agent": "Claude-Task-Notifier/1.0"}
-        )
-        with urllib.request.urlopen(req, timeout=10) as response:
-            if response.status == 200:
-                data = json.loads(response.read().decode("utf-8"))
-                if data.get("code") == 200:
-                    print(f"[OK]    Bark notification sent (level: {level})")
-                    return True
-                else:
-                    print(f"[WARN]  Bark response: {data.get('message', 'Unknown error')}", file=sys.stderr)
+        if _bark_proxy(parts.scheme, parts.hostname):
+            status, reason, body = _bark_urlopen(f"{parts.scheme}://{parts.netloc}{path}")
+        else:
+            status, reason, body = _bark_get(parts.scheme, parts.netloc, path)
+            if status in (301, 302, 303, 307, 308):
+                # e.g. a self-hosted server redirecting http to https
+                _drop_connection(parts.scheme, parts.netloc)
+                status, reason, body = _bark_urlopen(f"{parts.scheme}://{parts.netloc}{path}")
+        if status != 200:
+            _drop_connection(parts.scheme, parts.netloc)
+            _print(f"[WARN]  Bark HTTP error: {status} - {reason}", file=sys.stderr)
             return False
-    except urllib.error.HTTPError as e:
-        print(f"[WARN]  Bark HTTP error: {e.code} - {e.reason}", file=sys.stderr)
+        code = _bark_code(body)
+        data = None
+        if code is None:
+            # Unusual layout: fall back to a full parse
+            import json
+            data = json.loads(body)
+            code = data.get("code")
+        if code == 200:
+            _print(f"[OK]    Bark notification sent (level: {LEVEL_NAMES[level]})")
+            return True
+
+        # Only the error path needs the full reply, unless it was parsed above
+        if data is None:
+            import json
+            data = json.loads(body)
+        _print(f"[WARN]  Bark response: {data.get('message', 'Unknown error')}", file=sys.stderr)
         return False
-    except urllib.error.URLError as e:
-        print(f"[WARN]  Bark connection error: {e.reason}", file=sys.stderr)
+    except (http.client.HTTPException, OSError) as e:
+        _print(f"[WARN]  Bark connection error: {e}", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"[WARN]  Bark notification failed: {e}", file=sys.stderr)
+        _print(f"[WARN]  Bark notification failed: {e}", file=sys.stderr)
+        return False
+
+
+def _bark_code(body):
+    """Read the integer "code" field of a Bark reply without parsing JSON.
+
+    Returns None if the field cannot be read this way.
+    """
+    start = body.find(b'"code":')
+    if start == -1:
+        return None
+    value = body[start + 7:].split(b",", 1)[0].split(b"}", 1)[0]
+    try:
+        return int(value)
+    except ValueError:
+        return None
+
+
+def _bark_get(scheme, netloc, path):
+    """GET path from the Bark server over a pooled connection.
+
+    Returns (status, reason, body). A pooled connection that the server has
+    since closed is retried once on a fresh connection.
+    """
+    import http.client
+
+    reused = (scheme, netloc) in _CONN_CACHE
+    conn = _get_connection(scheme, netloc)
+    try:
+        conn.request("GET", path, headers={"User-Agent": "Claude-Task-Notifier/1.0"})
+        response = conn.getresponse()
+        # Drain the body so the connection can be reused
+        return response.status, response.reason, response.read()
+    except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+        _drop_connection(scheme, netloc)
+        if not reused:
+            raise
+        return _bark_get(scheme, netloc, path)
+    except Exception:
+        _drop_connection(scheme, netloc)
+        raise
+
+
+def _bark_proxy(scheme, host):
+    """Whether urllib would send a request to host through a proxy."""
+    # Proxies on Linux come only from *_proxy variables; skip urllib.request without them
+    if _SYSTEM not in ("Darwin", "Windows") and not any(name.lower().endswith("_proxy") for name in os.environ):
         return False
 
+    import urllib.request
+
+    return scheme in urllib.request.getproxies() and not urllib.request.proxy_bypass(host)
+
+
+def _bark_urlopen(url):
+    """GET url through urllib, which applies proxy settings and follows redirects.
+
+    Returns (status, reason, body) like _bark_get().
+    """
+    import urllib.error
+    import urllib.request
+
+    request = urllib.request.Request(url, headers={"User-Agent": "Claude-Task-Notifier/1.0"})
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, response.reason, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.reason, e.read()
+
+
+def _get_connection(scheme, netloc):
+    """Get (or open) the pooled connection for a Bark server."""
+    import http.client
+
+    conn = _CONN_CACHE.get((scheme, netloc))
+    if conn is None:
+        if scheme == "http":
+            conn = http.client.HTTPConnection(netloc, timeout=10)
+        else:
+            conn = http.client.HTTPSConnection(netloc, timeout=10)
+        _CONN_CACHE[(scheme, netloc)] = conn
+    return conn
+
+
+def _drop_connection(scheme, netloc):
+    """Close and forget the pooled connection for a Bark server."""
+    conn = _CONN_CACHE.pop((scheme, netloc), None)
+    if conn is not None:
+        conn.close()
+
+
+@atexit.register
+def _close_connections():
+    """Close all pooled Bark connections."""
+    while _CONN_CACHE:
+        _, conn = _CONN_CACHE.popitem()
+        conn.close()
+
 
 # =============================================================================
 # System Notification
@@ -147,28 +424,19 @@ def send_bark_notification(config, level, message):
 
 def send_system_notification(level, message):
     """Send desktop notification based on OS."""
-    system = platform.system()
-
-    title_map = {
-        "success": "✅ Task Completed",
-        "error": "❌ Task Failed",
-        "info": "ℹ️ Task Notification"
-    }
-    title = title_map.get(level, "Task Notification")
-
-    if system == "Darwin":  # macOS
-        return _send_macos_notification(title, message)
-    elif system == "Linux":
-        return _send_linux_notification(title, message)
-    elif system == "Windows":
-        return _send_windows_notification(title, message)
-    else:
-        print(f"[WARN]  Unsupported OS for system notification: {system}", file=sys.stderr)
+    title = TITLES[level]
+
+    send = _SYSTEM_NOTIFIERS.get(_SYSTEM)
+    if send is None:
+        _print(f"[WARN]  Unsupported OS for system notification: {_SYSTEM}", file=sys.stderr)
         return False
+    return send(title, message)
 
 
 def _send_macos_notification(title, message):
     """Send notification on macOS using osascript."""
+    import subprocess
+
     script = f'display notification "{message}" with title "{title}"'
     try:
         subprocess.run(
@@ -177,18 +445,34 @@ def _send_macos_notification(title, message):
             capture_output=True,
             timeout=5
         )
-        print(f"[OK]    System notification sent (macOS)")
+        _print(f"[OK]    System notification sent (macOS)")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"[WARN]  macOS notification failed: {e.stderr.decode().strip()}", file=sys.stderr)
+        _print(f"[WARN]  macOS notification failed: {e.stderr.decode().strip()}", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"[WARN]  macOS notification error: {e}", file=sys.stderr)
+        _print(f"[WARN]  macOS notification error: {e}", file=sys.stderr)
         return False
 
 
 def _send_linux_notification(title, message):
-    """Send notification on Linux using notify-send."""
+    """Send notification on Linux via libnotify, falling back to notify-send."""
+    libnotify = _load_libnotify()
+    if libnotify is not None:
+        notification = libnotify.notify_notification_new(
+            title.encode("utf-8"), message.encode("utf-8"), None
+        )
+        if notification:
+            try:
+                shown = libnotify.notify_notification_show(notification, None)
+            finally:
+                libnotify.g_object_unref(notification)
+            if shown:
+                _print(f"[OK]    System notification sent (Linux)")
+                return True
+
+    import subprocess
+
     try:
         subprocess.run(
             ["notify-send", title, message],
@@ -196,109 +480,170 @@ def _send_linux_notification(title, message):
             capture_output=True,
             timeout=5
         )
-        print(f"[OK]    System notification sent (Linux)")
+        _print(f"[OK]    System notification sent (Linux)")
         return True
     except FileNotFoundError:
-        print("[WARN]  notify-send not found. Install: sudo apt install libnotify-bin", file=sys.stderr)
+        _print("[WARN]  notify-send not found. Install: sudo apt install libnotify-bin", file=sys.stderr)
         return False
     except subprocess.CalledProcessError as e:
-        print(f"[WARN]  Linux notification failed: {e.stderr.decode().strip()}", file=sys.stderr)
+        _print(f"[WARN]  Linux notification failed: {e.stderr.decode().strip()}", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"[WARN]  Linux notification error: {e}", file=sys.stderr)
+        _print(f"[WARN]  Linux notification error: {e}", file=sys.stderr)
         return False
 
 
-def _send_windows_notification(title, message):
-    """Send notification on Windows using PowerShell BurntToast."""
-    ps_script = f'''
-    Add-Type -AssemblyName Windows.UI.Notifications
-    Add-Type -AssemblyName Windows.Data.Xml.Dom
-
-    [Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null
-    [Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom, ContentType = WindowsRuntime] | Out-Null
-
-    $template = @"
-    <toast>
-        <visual>
-            <binding template="ToastGeneric">
-                <text>{title}</text>
-                <text>{message}</text>
-            </binding>
-        </visual>
-    </toast>
+def _load_libnotify():
+    """Load and initialise libnotify through ctypes, or return None."""
+    global _LIBNOTIFY
+    import ctypes
+
+    if _LIBNOTIFY is None:
+        try:
+            lib = ctypes.CDLL("libnotify.so.4")
+            lib.notify_init.argtypes = [ctypes.c_char_p]
+            lib.notify_init.restype = ctypes.c_int
+            lib.notify_notification_new.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p]
+            lib.notify_notification_new.restype = ctypes.c_void_p
+            lib.notify_notification_show.argtypes = [ctypes.c_void_p, ctypes.c_void_p]
+            lib.notify_notification_show.restype = ctypes.c_int
+            lib.g_object_unref.argtypes = [ctypes.c_void_p]
+            lib.g_object_unref.restype = None
+            if not lib.notify_init(b"task-notifier"):
+                raise OSError("notify_init failed")
+            _LIBNOTIFY = lib
+        except (OSError, AttributeError):
+            _LIBNOTIFY = False
+    return _LIBNOTIFY or None
+
+
+# PowerShell toast script, written to disk once and run with -File
+_PS_TOAST_SCRIPT = r'''param([string]$Title, [string]$Message)
+
+Add-Type -AssemblyName Windows.UI.Notifications
+Add-Type -AssemblyName Windows.Data.Xml.Dom
+
+[Windows.UI.Notifications.ToastNotificationManager, Windows.UI.Notifications, ContentType = WindowsRuntime] | Out-Null
+[Windows.Data.Xml.Dom.XmlDocument, Windows.Data.Xml.Dom, ContentType = WindowsRuntime] | Out-Null
+
+$title = [System.Security.SecurityElement]::Escape($Title)
+$message = [System.Security.SecurityElement]::Escape($Message)
+$template = @"
+<toast>
+    <visual>
+        <binding template="ToastGeneric">
+            <text>$title</text>
+            <text>$message</text>
+        </binding>
+    </visual>
+</toast>
 "@
 
-    $xml = New-Object Windows.Data.Xml.Dom.XmlDocument
-    $xml.LoadXml($template)
-    $toast = New-Object Windows.UI.Notifications.ToastNotification $xml
-    [Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Claude Task Notifier").Show($toast)
-    '''
+$xml = New-Object Windows.Data.Xml.Dom.XmlDocument
+$xml.LoadXml($template)
+$toast = New-Object Windows.UI.Notifications.ToastNotification $xml
+[Windows.UI.Notifications.ToastNotificationManager]::CreateToastNotifier("Claude Task Notifier").Show($toast)
+'''
+
+
+def _send_windows_notification(title, message):
+    """Send notification on Windows using a PowerShell toast script."""
+    import subprocess
 
     try:
+        # Title and message are passed as arguments, never spliced into the script
         subprocess.run(
-            ["powershell", "-NoProfile", "-Command", ps_script],
+            _powershell_file_command("toast.ps1", _PS_TOAST_SCRIPT) + ["-Title", title, "-Message", message],
             check=True,
             capture_output=True,
             timeout=10
         )
-        print(f"[OK]    System notification sent (Windows)")
+        _print(f"[OK]    System notification sent (Windows)")
         return True
     except subprocess.CalledProcessError as e:
-        print(f"[WARN]  Windows notification failed: {e.stderr.decode().strip()}", file=sys.stderr)
+        _print(f"[WARN]  Windows notification failed: {e.stderr.decode().strip()}", file=sys.stderr)
         return False
     except Exception as e:
-        print(f"[WARN]  Windows notification error: {e}", file=sys.stderr)
+        _print(f"[WARN]  Windows notification error: {e}", file=sys.stderr)
         return False
 
 
+def _powershell_file_command(name, script):
+    """Return a powershell -File command line for script, writing it if needed.
+
+    Scripts live in %LOCALAPPDATA%\\task-notifier and are only rewritten when
+    their content differs from the given script.
+    """
+    local_app_data = os.environ.get("LOCALAPPDATA")
+    script_dir = os.path.join(local_app_data, "task-notifier") if local_app_data else CACHE_DIR
+    script_path = os.path.join(script_dir, name)
+
+    try:
+        with open(script_path, "r", encoding="utf-8") as f:
+            current = f.read()
+    except OSError:
+        current = None
+
+    if current != script:
+        _write_atomic(script_path, script.encode("utf-8"))
+
+    return ["powershell", "-NoLogo", "-NoProfile", "-ExecutionPolicy", "Bypass", "-File", script_path]
+
+
+# Desktop notification sender per OS
+_SYSTEM_NOTIFIERS = {
+    "Darwin": _send_macos_notification,
+    "Linux": _send_linux_notification,
+    "Windows": _send_windows_notification,
+}
+
+
 # =============================================================================
 # Sound Notification
 # =============================================================================
 
 def play_sound(level):
     """Play sound based on notification level and OS."""
-    system = platform.system()
-
-    if system == "Darwin":  # macOS
-        return _play_macos_sound(level)
-    elif system == "Linux":
-        return _play_linux_sound(level)
-    elif system == "Windows":
-        return _play_windows_sound(level)
-    else:
-        print(f"[WARN]  Unsupported OS for sound: {system}", file=sys.stderr)
+    play = _SOUND_PLAYERS.get(_SYSTEM)
+    if play is None:
+        _print(f"[WARN]  Unsupported OS for sound: {_SYSTEM}", file=sys.stderr)
         return False
+    return play(level)
 
 
 def _play_macos_sound(level):
-    """Play system sound on macOS using afplay."""
-    sound_name = SOUND_MAP.get(level, "Ping")
+    """Play system sound on macOS using afplay (without waiting for it)."""
+    sound_name = MACOS_SOUNDS[level]
     sound_path = f"/System/Library/Sounds/{sound_name}.aiff"
 
-    if not os.path.exists(sound_path):
-        print(f"[WARN]  Sound not found: {sound_path}", file=sys.stderr)
-        return False
-
+    # No existence check: a missing file only costs the detached afplay
     try:
-        subprocess.run(
-            ["afplay", sound_path],
-            check=True,
-            capture_output=True,
-            timeout=5
-        )
-        print(f"[OK]    Sound played: {sound_name}")
+        _spawn_detached(["afplay", sound_path])
+        _print(f"[OK]    Sound dispatched: {sound_name}")
         return True
-    except subprocess.CalledProcessError:
-        print(f"[WARN]  Failed to play sound: {sound_name}", file=sys.stderr)
-        return False
     except Exception as e:
-        print(f"[WARN]  Sound playback error: {e}", file=sys.stderr)
+        _print(f"[WARN]  Sound playback error: {e}", file=sys.stderr)
         return False
 
 
 def _play_linux_sound(level):
-    """Play sound on Linux using aplay or paplay."""
+    """Play sound on Linux using paplay or aplay (without waiting for it)."""
+    global _LINUX_SOUND_CACHE
+
+    # Replay the last working (command, file) pair without probing
+    cached = _LINUX_SOUND_CACHE or _read_linux_sound_cache()
+    if cached is not None and os.path.exists(cached[1]):
+        try:
+            _spawn_detached(list(cached))
+            _LINUX_SOUND_CACHE = cached
+            _print(f"[OK]    Sound dispatched: {os.path.basename(cached[1])}")
+            return True
+        except FileNotFoundError:
+            pass
+    if cached is not None:
+        _LINUX_SOUND_CACHE = None
+        _write_linux_sound_cache(None)
+
     # Try paplay (PulseAudio) first, then aplay (ALSA)
     commands = ["paplay", "aplay"]
 
@@ -309,108 +654,333 @@ def _play_linux_sound(level):
         "/usr/share/sounds/freedesktop/stereo/dialog-information.oga"
     ]
 
+    found_file = False
     for cmd in commands:
         for sound_file in sound_files:
             if not os.path.exists(sound_file):
                 continue
+            found_file = True
             try:
-                subprocess.run(
-                    [cmd, sound_file],
-                    check=True,
-                    capture_output=True,
-                    timeout=5
-                )
-                print(f"[OK]    Sound played: {os.path.basename(sound_file)}")
-                return True
-            except (subprocess.CalledProcessError, FileNotFoundError):
+                proc = _spawn_detached([cmd, sound_file])
+            except FileNotFoundError:
+                # Player not installed; the next one may be
+                break
+            # Only remember a pair the player did not reject straight away
+            # (e.g. paplay with no PulseAudio server exits with an error)
+            if _exited_with_error(proc):
                 continue
+            _LINUX_SOUND_CACHE = (cmd, sound_file)
+            _write_linux_sound_cache(_LINUX_SOUND_CACHE)
+            _print(f"[OK]    Sound dispatched: {os.path.basename(sound_file)}")
+            return True
 
-    print("[WARN]  No sound files found. Install: sudo apt install freedesktop-sound-theme", file=sys.stderr)
+    if found_file:
+        _print("[WARN]  No sound player could play the system sounds (tried paplay, aplay)", file=sys.stderr)
+    else:
+        _print("[WARN]  No sound files found. Install: sudo apt install freedesktop-sound-theme", file=sys.stderr)
     return False
 
 
+def _exited_with_error(proc, timeout=0.2):
+    """Give a just-started player a moment; True if it has already failed."""
+    import subprocess
+
+    try:
+        return proc.wait(timeout=timeout) != 0
+    except subprocess.TimeoutExpired:
+        # Still playing
+        return False
+
+
+def _read_linux_sound_cache():
+    """Read the cached (command, sound file) pair, or None."""
+    try:
+        with open(LINUX_SOUND_CACHE_PATH, "r", encoding="utf-8") as f:
+            entry = f.read().splitlines()
+    except OSError:
+        return None
+    return tuple(entry) if len(entry) == 2 else None
+
+
+def _write_linux_sound_cache(entry):
+    """Persist (or with None, remove) the cached (command, sound file) pair."""
+    try:
+        if entry is None:
+            os.remove(LINUX_SOUND_CACHE_PATH)
+        else:
+            os.makedirs(os.path.dirname(LINUX_SOUND_CACHE_PATH), exist_ok=True)
+            with open(LINUX_SOUND_CACHE_PATH, "w", encoding="utf-8") as f:
+                f.write("\n".join(entry) + "\n")
+    except OSError:
+        pass
+
+
+# PowerShell sound script, written to disk once and run with -File
+_PS_SOUND_SCRIPT = r'''param([string]$Name)
+
+[System.Media.SystemSounds]::$Name.Play()
+'''
+
+
 def _play_windows_sound(level):
-    """Play sound on Windows using PowerShell."""
-    sound_map = {
-        "success": "System.Asterisk",
-        "error": "System.Hand",
-        "info": "System.Default"
-    }
-    sound_name = sound_map.get(level, "System.Default")
-
-    ps_script = f'''
-    $sound = New-Object System.Media.SystemSound::{sound_name}
-    $sound.Play()
-    '''
+    """Play sound on Windows using PowerShell (without waiting for it)."""
+    sound_name = WINDOWS_SOUNDS[level]
 
     try:
-        subprocess.run(
-            ["powershell", "-NoProfile", "-Command", ps_script],
-            check=True,
-            capture_output=True,
-            timeout=5
-        )
-        print(f"[OK]    Sound played: {sound_name}")
+        _spawn_detached(_powershell_file_command("sound.ps1", _PS_SOUND_SCRIPT) + ["-Name", sound_name])
+        _print(f"[OK]    Sound dispatched: {sound_name}")
         return True
-    except subprocess.CalledProcessError:
-        print(f"[WARN]  Failed to play Windows sound", file=sys.stderr)
-        return False
     except Exception as e:
-        print(f"[WARN]  Windows sound error: {e}", file=sys.stderr)
+        _print(f"[WARN]  Windows sound error: {e}", file=sys.stderr)
+        return False
+
+
+def _spawn_detached(cmd):
+    """Start cmd in its own session with output discarded, without waiting."""
+    import subprocess
+
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True
+    )
+
+
+# Sound player per OS
+_SOUND_PLAYERS = {
+    "Darwin": _play_macos_sound,
+    "Linux": _play_linux_sound,
+    "Windows": _play_windows_sound,
+}
+
+
+# =============================================================================
+# Daemon
+# =============================================================================
+
+def _send_to_daemon(level, message):
+    """
+    Hand a notification to a running daemon.
+
+    Returns:
+        True if the daemon accepted it, False if there is no daemon to talk to
+    """
+    if not os.path.exists(SOCKET_PATH):
+        return False
+
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(2)
+            sock.connect(SOCKET_PATH)
+            sock.sendall(f"{LEVEL_NAMES[level]}\0{message}".encode("utf-8"))
+            # Closing our side marks the end of the message, which may contain newlines
+            sock.shutdown(socket.SHUT_WR)
+            return sock.recv(1) == b"1"
+    except OSError:
+        # Stale socket file or unresponsive daemon
         return False
 
 
+def run_daemon():
+    """Serve notifications on SOCKET_PATH until interrupted or terminated."""
+    import signal
+    import socket
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("[ERROR] --daemon requires Unix domain sockets, not available on this OS", file=sys.stderr)
+        sys.exit(1)
+
+    if os.path.exists(SOCKET_PATH):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(SOCKET_PATH)
+        except OSError:
+            # Left behind by a daemon that did not shut down cleanly
+            os.remove(SOCKET_PATH)
+        else:
+            print(f"[ERROR] A daemon is already listening on {SOCKET_PATH}", file=sys.stderr)
+            sys.exit(1)
+
+    # stdout is a pipe under systemd; flush each line so the journal keeps up
+    sys.stdout.reconfigure(line_buffering=True)
+
+    config = load_config()
+
+    os.makedirs(os.path.dirname(SOCKET_PATH), exist_ok=True)
+    # Let SIGTERM (systemctl stop) unwind through the cleanup below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    server = _create_daemon_server(SOCKET_PATH, config)
+    with server:
+        print(f"[INFO]  Daemon listening on {SOCKET_PATH}")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            try:
+                os.remove(SOCKET_PATH)
+            except OSError:
+                pass
+            # Let notifications that were already acknowledged go out
+            server.queue.put(None)
+            server.worker.join()
+
+
+def _create_daemon_server(path, config):
+    """
+    Bind the daemon's server on path and start its dispatch worker.
+
+    Each client is read and acknowledged on its own thread, so a slow or stuck
+    client never holds up the others. Notifications are then sent one at a time
+    by a single worker, which keeps the pooled Bark connection single-threaded.
+    """
+    import queue
+    import socketserver
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self):
+            _handle_daemon_request(self.request, self.server)
+
+    # Create the socket owner-only from the start, not chmod'ed after binding
+    old_umask = os.umask(0o077)
+    try:
+        server = socketserver.ThreadingUnixStreamServer(path, Handler)
+    finally:
+        os.umask(old_umask)
+    server.daemon_threads = True
+    server.config = config
+    server.queue = queue.SimpleQueue()
+    server.worker = threading.Thread(target=_daemon_worker, args=(server,), daemon=True)
+    server.worker.start()
+    return server
+
+
+def _handle_daemon_request(conn, server):
+    """Read and acknowledge one client's notification, then queue it for sending."""
+    # A client that never finishes its message only ties up its own thread
+    conn.settimeout(5)
+    try:
+        with conn.makefile("rb") as stream:
+            name, _, message = stream.read().decode("utf-8", "replace").partition("\0")
+
+        level = _LEVELS.get(name)
+        # Reply before dispatching so the client can exit straight away
+        conn.sendall(b"0" if level is None else b"1")
+    except OSError:
+        # Client timed out or went away; it sends the notification itself
+        return
+
+    if level is not None:
+        server.queue.put((level, message))
+
+
+def _daemon_worker(server):
+    """Send queued notifications in order until a None sentinel arrives."""
+    while True:
+        item = server.queue.get()
+        if item is None:
+            return
+        level, message = item
+
+        # Pick up config.json edits; keep the last good config if it is now broken
+        try:
+            server.config = load_config()
+        except SystemExit:
+            pass
+
+        try:
+            dispatch(server.config, level, message)
+        except Exception as e:
+            print(f"[ERROR] Daemon failed to send notification: {e}", file=sys.stderr)
+
+
 # =============================================================================
 # Main Entry
 # =============================================================================
 
 def main():
     """Main entry point."""
+    if sys.argv[1:] == ["--daemon"]:
+        run_daemon()
+        return
+
     if len(sys.argv) != 3:
-        print(f"Usage: python3 {os.path.basename(__file__)} <level> <message>", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("  level:   success | error | info", file=sys.stderr)
-        print("  message: Notification message (use quotes for spaces)", file=sys.stderr)
-        print("", file=sys.stderr)
-        print("Examples:", file=sys.stderr)
-        print(f"  python3 {os.path.basename(__file__)} success \"Build completed!\"", file=sys.stderr)
-        print(f"  python3 {os.path.basename(__file__)} error \"Tests failed!\"", file=sys.stderr)
-        print(f"  python3 {os.path.basename(__file__)} info \"Task in progress...\"", file=sys.stderr)
+        sys.stderr.write(_USAGE)
         sys.exit(1)
 
-    level = sys.argv[1].lower()
     message = sys.argv[2]
 
-    # Validate level
-    if level not in BARK_CONFIG:
-        print(f"[ERROR] Invalid level: {level}", file=sys.stderr)
-        print(f"[INFO]  Valid levels: {', '.join(BARK_CONFIG.keys())}", file=sys.stderr)
+    # Parse and validate level once; channels index per-level tuples with it
+    level = _LEVELS.get(sys.argv[1].lower())
+    if level is None:
+        print(f"[ERROR] Invalid level: {sys.argv[1].lower()}", file=sys.stderr)
+        print(f"[INFO]  Valid levels: {', '.join(LEVEL_NAMES)}", file=sys.stderr)
         sys.exit(1)
 
-    # Load configuration
-    config = load_config()
+    # Global off switch, checked before any config or channel work
+    if os.environ.get("TASK_NOTIFIER_DISABLE", "") not in ("", "0"):
+        sys.exit(0)
+
+    # Hand off to a running daemon, which already holds the Bark connection
+    if _send_to_daemon(level, message):
+        print("[OK]    Notification handed to daemon")
+        return
+
+    dispatch(load_config(), level, message)
+
 
-    # Send notifications based on configuration
+def dispatch(config, level, message):
+    """
+    Send a notification on all enabled channels and print a summary.
+
+    Returns:
+        list: (channel, success) pairs, empty if nothing was sent
+    """
+    if not (config.bark_key or config.system_notify_enabled or config.sound_enabled):
+        print("[WARN]  All notification channels are disabled, nothing to send", file=sys.stderr)
+        return []
+
+    # Drop repeats of the same notification fired in quick succession
+    if config.dedupe_window_sec > 0 and _is_duplicate(level, message, config.dedupe_window_sec):
+        print(f"[DEDUP] Same notification sent in the last {config.dedupe_window_sec:g}s, skipping")
+        return []
+
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    # Send notifications on all enabled channels concurrently
     results = []
 
-    # Bark notification (always attempt if configured)
-    bark_result = send_bark_notification(config, level, message)
-    results.append(("Bark", bark_result))
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        futures = {}
+
+        # Bark notification (only submitted when a key is configured)
+        if config.bark_key:
+            futures[executor.submit(send_bark_notification, config, level, message)] = "Bark"
+        else:
+            print("[WARN]  bark_key is empty, skipping Bark notification", file=sys.stderr)
+            results.append(("Bark", False))
+
+        # System notification
+        if config.system_notify_enabled:
+            futures[executor.submit(send_system_notification, level, message)] = "System"
 
-    # System notification
-    if config.get("system_notify_enabled", True):
-        system_result = send_system_notification(level, message)
-        results.append(("System", system_result))
+        # Sound notification
+        if config.sound_enabled:
+            futures[executor.submit(play_sound, level)] = "Sound"
 
-    # Sound notification
-    if config.get("sound_enabled", True):
-        sound_result = play_sound(level)
-        results.append(("Sound", sound_result))
+        for future in as_completed(futures):
+            results.append((futures[future], future.result()))
 
     # Print summary
     print("", file=sys.stderr)
     success_count = sum(1 for _, r in results if r)
     print(f"[SUMMARY] Notification complete: {success_count}/{len(results)} channels succeeded")
+    return results
 
 
 if __name__ == "__main__":
@@ -5,8 +5,8 @@ Ensures consistent invocation pattern (even with zero dependencies)
 """
 
 import sys
-import subprocess
-from pathlib import Path
+import os
+import runpy
 
 
 def main():
@@ -29,20 +29,21 @@ def main():
         script_name += '.py'
 
     # Get script path (scripts/ is relative to this run.py file)
-    script_path = Path(__file__).parent / script_name
+    script_dir = os.path.dirname(os.path.realpath(__file__))
+    script_path = os.path.join(script_dir, script_name)
 
-    if not script_path.exists():
+    if not os.path.exists(script_path):
         print(f"❌ Script not found: {script_name}")
-        print(f"   Skill directory: {Path(__file__).parent.parent}")
+        print(f"   Skill directory: {os.path.dirname(script_dir)}")
         print(f"   Looked for: {script_path}")
         sys.exit(1)
 
-    # Execute the script (no venv needed - zero dependency design)
-    cmd = [sys.executable, str(script_path)] + script_args
+    # Execute the script in this interpreter (no venv needed - zero dependency design)
+    sys.argv = [script_path] + script_args
 
     try:
-        result = subprocess.run(cmd)
-        sys.exit(result.returncode)
+        runpy.run_path(script_path, run_name="__main__")
+        sys.exit(0)
     except KeyboardInterrupt:
         print("\n⚠️ Interrupted by user")
         sys.exit(130)
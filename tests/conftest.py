@@ -0,0 +1,28 @@
+"""
+Shared pytest setup for the notify.py test suite
+"""
+
+import os
+import py_compile
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent / "scripts"
+
+# Make scripts/ importable; runs once in every xdist worker
+sys.path.insert(0, str(SCRIPTS_DIR))
+
+# Compile notify.py into __pycache__ once, in the controller, before xdist
+# starts its workers. Workers (and subprocesses started by tests) then load
+# the cached bytecode; py_compile writes it even under PYTHONDONTWRITEBYTECODE,
+# and reading a .pyc is unaffected by that setting.
+if "PYTEST_XDIST_WORKER" not in os.environ:
+    py_compile.compile(str(SCRIPTS_DIR / "notify.py"), doraise=True)
+
+
+def pytest_configure(config):
+    """Register custom markers."""
+    config.addinivalue_line(
+        "markers",
+        "xdist_group(name): run the marked tests in a single xdist worker (needs --dist loadgroup)"
+    )
@@ -1,23 +1,31 @@
 #!/usr/bin/env python3
 """
 Comprehensive tests for scripts/notify.py
-Uses only Python standard library (unittest, unittest.mock)
+Run with pytest; pytest-xdist spreads the suite across CPU cores
 """
 
 import unittest
+import io
 import json
 import os
 import sys
 import subprocess
+import http.client
+import urllib.error
+import urllib.parse
 import tempfile
+import threading
+import time
 import shutil
+import socket
+import types
+from contextlib import ExitStack
 from pathlib import Path
-from unittest.mock import patch, MagicMock, Mock, call
-from urllib.error import HTTPError, URLError
+from unittest.mock import patch, Mock, call
 
-# Add parent directory to path for imports
-sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
+import pytest
 
+# scripts/ is put on sys.path by conftest.py
 import notify
 
 
@@ -27,145 +35,188 @@ class TestConfigPath(unittest.TestCase):
     def test_get_config_path(self):
         """Test that config path is correctly resolved (in skill root)."""
         result = notify.get_config_path()
-        self.assertIsInstance(result, Path)
-        self.assertTrue(result.name == "config.json")
+        self.assertIsInstance(result, str)
+        self.assertTrue(os.path.basename(result) == "config.json")
         # Config should be in skill root (parent of scripts/ directory)
         self.assertNotIn("scripts", str(result))
 
 
-class TestLoadConfig(unittest.TestCase):
+class TestLoadConfig:
     """Test configuration loading."""
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.temp_dir = tempfile.mkdtemp()
-        self.test_config_path = Path(self.temp_dir) / "config.json"
+    @pytest.fixture
+    def config_path(self, tmp_path, monkeypatch):
+        """Point get_config_path() at a config.json in a per-test directory."""
+        path = tmp_path / "config.json"
+        monkeypatch.setattr(notify, 'get_config_path', lambda: str(path))
+        return path
 
-    def tearDown(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir)
-
-    @patch('notify.get_config_path')
-    def test_load_config_success(self, mock_get_config_path):
+    def test_load_config_success(self, config_path):
         """Test successful config loading."""
-        test_config = {
+        config_path.write_text(json.dumps({
             "bark_server": "https://test.example.com",
             "bark_key": "test_key_123",
             "sound_enabled": True,
             "system_notify_enabled": False
-        }
-        mock_get_config_path.return_value = self.test_config_path
-
-        with open(self.test_config_path, 'w') as f:
-            json.dump(test_config, f)
+        }))
 
         result = notify.load_config()
-        self.assertEqual(result["bark_server"], "https://test.example.com")
-        self.assertEqual(result["bark_key"], "test_key_123")
-        self.assertTrue(result["sound_enabled"])
-        self.assertFalse(result["system_notify_enabled"])
-
-    @patch('notify.get_config_path')
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_load_config_file_not_found(self, mock_stderr, mock_get_config_path):
+        assert result.bark_server == "https://test.example.com"
+        assert result.bark_key == "test_key_123"
+        assert result.sound_enabled
+        assert result.dedupe_window_sec == 5
+        assert not result.system_notify_enabled
+
+    def test_normalize_config_defaults(self):
+        """Test that missing keys get defaults and strings are cleaned up once."""
+        result = notify._normalize_config({
+            "bark_key": "  test_key_123  ",
+            "bark_server": "https://test.example.com/"
+        })
+
+        assert result.bark_key == "test_key_123"
+        assert result.bark_server == "https://test.example.com"
+        assert result.bark_group == "Claude Code"
+        assert result.icons == {}
+        assert result.system_notify_enabled
+        assert result.sound_enabled
+
+    @pytest.mark.parametrize("value, expected", [
+        ("10", 10.0),
+        (2.5, 2.5),
+        ("soon", 5.0),
+        (None, 5.0)
+    ])
+    def test_normalize_config_dedupe_window(self, value, expected):
+        """Test that dedupe_window_sec is coerced to a number, with a fallback to 5."""
+        result = notify._normalize_config({"dedupe_window_sec": value})
+
+        assert result.dedupe_window_sec == expected
+        # dispatch() compares the window against 0
+        assert result.dedupe_window_sec > 0
+
+    def test_load_config_uses_cache(self, config_path):
+        """Test that an unchanged config.json is served from the pickle cache."""
+        config_path.write_text(json.dumps({"bark_key": "cached_key"}))
+
+        first = notify.load_config()
+        assert (config_path.parent / notify.CONFIG_CACHE_NAME).exists()
+
+        with patch('json.load') as mock_json_load:
+            second = notify.load_config()
+            mock_json_load.assert_not_called()
+
+        assert first == second
+
+    def test_load_config_cache_invalidated(self, config_path):
+        """Test that editing config.json bypasses a stale cache."""
+        config_path.write_text(json.dumps({"bark_key": "old"}))
+        notify.load_config()
+
+        config_path.write_text(json.dumps({"bark_key": "new_key"}))
+
+        assert notify.load_config().bark_key == "new_key"
+
+    def test_load_config_corrupt_cache(self, config_path):
+        """Test that a corrupt cache falls back to parsing JSON."""
+        config_path.write_text(json.dumps({"bark_key": "test_key_123"}))
+        (config_path.parent / notify.CONFIG_CACHE_NAME).write_bytes(b"not a pickle")
+
+        assert notify.load_config().bark_key == "test_key_123"
+
+    def test_load_config_file_not_found(self, config_path):
         """Test loading config when file doesn't exist."""
-        mock_get_config_path.return_value = Path("/nonexistent/config.json")
-
-        with self.assertRaises(SystemExit) as context:
+        with pytest.raises(SystemExit) as context:
             notify.load_config()
-        self.assertEqual(context.exception.code, 1)
+        assert context.value.code == 1
 
-    @patch('notify.get_config_path')
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_load_config_invalid_json(self, mock_stderr, mock_get_config_path):
+    def test_load_config_invalid_json(self, config_path):
         """Test loading config with invalid JSON."""
-        mock_get_config_path.return_value = self.test_config_path
-
-        with open(self.test_config_path, 'w') as f:
-            f.write("{ invalid json }")
+        config_path.write_text("{ invalid json }")
 
-        with self.assertRaises(SystemExit) as context:
+        with pytest.raises(SystemExit) as context:
             notify.load_config()
-        self.assertEqual(context.exception.code, 1)
+        assert context.value.code == 1
 
-    @patch('notify.get_config_path')
-    @patch('sys.stderr', new_callable=MagicMock)
-    @patch('builtins.open', side_effect=PermissionError("Access denied"))
-    def test_load_config_permission_error(self, mock_open, mock_stderr, mock_get_config_path):
+    def test_load_config_permission_error(self, config_path, monkeypatch):
         """Test loading config with permission error."""
-        mock_get_config_path.return_value = self.test_config_path
+        config_path.write_text("{}")
+        monkeypatch.setattr('builtins.open', Mock(side_effect=PermissionError("Access denied")))
 
-        with self.assertRaises(SystemExit) as context:
+        with pytest.raises(SystemExit) as context:
             notify.load_config()
-        self.assertEqual(context.exception.code, 1)
+        assert context.value.code == 1
 
 
-class TestBarkNotification(unittest.TestCase):
-    """Test Bark notification functionality."""
+@pytest.fixture
+def bark_config():
+    """Raw Bark config with custom icons for every level."""
+    return {
+        "bark_server": "https://api.day.app",
+        "bark_key": "test_key_123",
+        "bark_group": "TestGroup",
+        "icons": {
+            "success": "https://example.com/success.png",
+            "error": "https://example.com/error.png",
+            "info": "https://example.com/info.png"
+        },
+        "sound_enabled": True,
+        "system_notify_enabled": True
+    }
 
-    def setUp(self):
-        """Set up test fixtures."""
-        self.config = {
-            "bark_server": "https://api.day.app",
-            "bark_key": "test_key_123",
-            "bark_group": "TestGroup",
-            "icons": {
-                "success": "https://example.com/success.png",
-                "error": "https://example.com/error.png",
-                "info": "https://example.com/info.png"
-            },
-            "sound_enabled": True,
-            "system_notify_enabled": True
-        }
 
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_success(self, mock_print, mock_urlopen):
-        """Test successful Bark notification."""
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_response.read.return_value = b'{"code": 200, "message": "success"}'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+class _FakeResp:
+    """Plain stand-in for http.client.HTTPResponse; cheaper than a mock."""
 
-        result = notify.send_bark_notification(self.config, "success", "Test message")
+    def __init__(self, status=200, reason="OK", body=b'{"code": 200, "message": "success"}'):
+        self.status = status
+        self.reason = reason
+        self._body = body
 
-        self.assertTrue(result)
-        mock_urlopen.assert_called_once()
-        # Verify URL construction (Request object has full_url attribute)
-        call_args = mock_urlopen.call_args
-        request = call_args[0][0]
-        url = request.full_url
-        self.assertIn("test_key_123", url)
-        self.assertIn("Test%20message", url)
-        self.assertIn("group=TestGroup", url)
-        self.assertIn("icon=https%3A%2F%2Fexample.com%2Fsuccess.png", url)
-
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_custom_icons(self, mock_print, mock_urlopen):
-        """Test Bark notification with custom icons."""
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_response.read.return_value = b'{"code": 200, "message": "success"}'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+    def read(self):
+        return self._body
 
-        result = notify.send_bark_notification(self.config, "error", "Error message")
 
-        self.assertTrue(result)
-        call_args = mock_urlopen.call_args
-        request = call_args[0][0]
-        url = request.full_url
-        self.assertIn("icon=https%3A%2F%2Fexample.com%2Ferror.png", url)
+@pytest.fixture
+def mock_bark_ok():
+    """Patch notify._get_connection with a connection whose reply is a Bark success."""
+    # Keep a proxy in the developer's environment from routing around the mock
+    with patch('notify._bark_proxy', return_value=False), \
+            patch('notify._get_connection', new_callable=Mock) as mock_get_connection:
+        mock_get_connection.return_value.getresponse.return_value = _FakeResp()
+        yield mock_get_connection
 
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_icon_fallback(self, mock_print, mock_urlopen):
-        """Test Bark notification with icon fallback to info."""
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_response.read.return_value = b'{"code": 200, "message": "success"}'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
 
+def _bark_path(mock_get_connection):
+    """Request path of the last Bark request sent through the mocked connection."""
+    return mock_get_connection.return_value.request.call_args[0][1]
+
+
+class TestBarkNotification:
+    """Test Bark notification functionality."""
+
+    def test_send_bark_notification_success(self, bark_config, mock_bark_ok):
+        """Test successful Bark notification."""
+        result = notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test message")
+
+        assert result
+        mock_bark_ok.assert_called_once_with("https", "api.day.app")
+        # Verify request path construction
+        url = _bark_path(mock_bark_ok)
+        assert "test_key_123" in url
+        assert "Test%20message" in url
+        assert "group=TestGroup" in url
+        assert "icon=https%3A%2F%2Fexample.com%2Fsuccess.png" in url
+
+    def test_send_bark_notification_custom_icons(self, bark_config, mock_bark_ok):
+        """Test Bark notification with custom icons."""
+        result = notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.ERROR, "Error message")
+
+        assert result
+        assert "icon=https%3A%2F%2Fexample.com%2Ferror.png" in _bark_path(mock_bark_ok)
+
+    def test_send_bark_notification_icon_fallback(self, mock_bark_ok):
+        """Test Bark notification with icon fallback to info."""
         config_no_icon = {
             "bark_server": "https://api.day.app",
             "bark_key": "test_key_123",
@@ -174,210 +225,290 @@ class TestBarkNotification(unittest.TestCase):
             }
         }
 
-        result = notify.send_bark_notification(config_no_icon, "success", "Test message")
+        result = notify.send_bark_notification(notify._normalize_config(config_no_icon), notify.Level.SUCCESS, "Test message")
 
-        self.assertTrue(result)
-        call_args = mock_urlopen.call_args
-        request = call_args[0][0]
-        url = request.full_url
+        assert result
         # Should fallback to info icon
-        self.assertIn("icon=https%3A%2F%2Fexample.com%2Finfo.png", url)
+        assert "icon=https%3A%2F%2Fexample.com%2Finfo.png" in _bark_path(mock_bark_ok)
 
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_no_icons(self, mock_print, mock_urlopen):
+    def test_send_bark_notification_no_icons(self, mock_bark_ok):
         """Test Bark notification without icons config."""
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_response.read.return_value = b'{"code": 200, "message": "success"}'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
-
         config_no_icons = {
             "bark_server": "https://api.day.app",
             "bark_key": "test_key_123"
         }
 
-        result = notify.send_bark_notification(config_no_icons, "success", "Test message")
+        result = notify.send_bark_notification(notify._normalize_config(config_no_icons), notify.Level.SUCCESS, "Test message")
 
-        self.assertTrue(result)
-        # Should still work, just without custom icon (using default from BARK_CONFIG)
-        call_args = mock_urlopen.call_args
-        request = call_args[0][0]
-        url = request.full_url
-        self.assertIn("test_key_123", url)
+        assert result
+        # Should still work, just without custom icon (using default from BARK_ICONS)
+        assert "test_key_123" in _bark_path(mock_bark_ok)
 
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_default_group(self, mock_print, mock_urlopen):
+    def test_send_bark_notification_default_group(self, mock_bark_ok):
         """Test Bark notification with default group."""
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_response.read.return_value = b'{"code": 200, "message": "success"}'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
-
         config_no_group = {
             "bark_server": "https://api.day.app",
             "bark_key": "test_key_123"
         }
 
-        result = notify.send_bark_notification(config_no_group, "success", "Test message")
+        result = notify.send_bark_notification(notify._normalize_config(config_no_group), notify.Level.SUCCESS, "Test message")
 
-        self.assertTrue(result)
-        call_args = mock_urlopen.call_args
-        request = call_args[0][0]
-        url = request.full_url
-        self.assertIn("group=Claude+Code", url)
+        assert result
+        assert "group=Claude+Code" in _bark_path(mock_bark_ok)
 
-    @patch('builtins.print')
-    def test_send_bark_notification_empty_key(self, mock_print):
+    def test_send_bark_notification_empty_key(self, bark_config):
         """Test Bark notification with empty key."""
-        config = self.config.copy()
-        config["bark_key"] = ""
+        bark_config["bark_key"] = ""
 
-        result = notify.send_bark_notification(config, "success", "Test message")
-
-        self.assertFalse(result)
+        assert not notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test message")
 
-    @patch('builtins.print')
-    def test_send_bark_notification_whitespace_key(self, mock_print):
+    def test_send_bark_notification_whitespace_key(self, bark_config):
         """Test Bark notification with whitespace-only key."""
-        config = self.config.copy()
-        config["bark_key"] = "   "
-
-        result = notify.send_bark_notification(config, "success", "Test message")
+        bark_config["bark_key"] = "   "
 
-        self.assertFalse(result)
+        assert not notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test message")
 
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_http_error(self, mock_print, mock_urlopen):
+    def test_send_bark_notification_http_error(self, bark_config, mock_bark_ok):
         """Test Bark notification with HTTP error."""
-        mock_urlopen.side_effect = HTTPError("url", 500, "Internal Server Error", {}, None)
+        mock_bark_ok.return_value.getresponse.return_value = _FakeResp(500, "Internal Server Error", b"")
 
-        result = notify.send_bark_notification(self.config, "success", "Test message")
+        assert not notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test message")
 
-        self.assertFalse(result)
-
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_url_error(self, mock_print, mock_urlopen):
+    def test_send_bark_notification_url_error(self, bark_config, mock_bark_ok):
         """Test Bark notification with URL error."""
-        mock_urlopen.side_effect = URLError("Connection refused")
+        mock_bark_ok.return_value.request.side_effect = ConnectionRefusedError("Connection refused")
 
-        result = notify.send_bark_notification(self.config, "success", "Test message")
-
-        self.assertFalse(result)
+        assert not notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test message")
 
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_timeout(self, mock_print, mock_urlopen):
+    def test_send_bark_notification_timeout(self, bark_config, mock_bark_ok):
         """Test Bark notification with timeout."""
-        mock_urlopen.side_effect = TimeoutError("Request timed out")
-
-        result = notify.send_bark_notification(self.config, "success", "Test message")
+        mock_bark_ok.return_value.request.side_effect = TimeoutError("Request timed out")
 
-        self.assertFalse(result)
+        assert not notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test message")
 
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_error_response(self, mock_print, mock_urlopen):
+    def test_send_bark_notification_error_response(self, bark_config, mock_bark_ok):
         """Test Bark notification with error response from server."""
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_response.read.return_value = b'{"code": 400, "message": "Bad Request"}'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_bark_ok.return_value.getresponse.return_value = _FakeResp(body=b'{"code": 400, "message": "Bad Request"}')
 
-        result = notify.send_bark_notification(self.config, "success", "Test message")
+        assert not notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test message")
 
-        self.assertFalse(result)
+    @pytest.mark.parametrize("level", list(notify.Level))
+    def test_send_bark_notification_all_levels(self, bark_config, mock_bark_ok, level):
+        """Test Bark notification for every level."""
+        assert notify.send_bark_notification(notify._normalize_config(bark_config), level, f"Test {level}")
 
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_all_levels(self, mock_print, mock_urlopen):
-        """Test Bark notification for all levels."""
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_response.read.return_value = b'{"code": 200, "message": "success"}'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        mock_bark_ok.return_value.request.assert_called_once()
+        assert f"level={notify.LEVEL_NAMES[level]}" in _bark_path(mock_bark_ok)
 
-        levels = ["success", "error", "info"]
-        for level in levels:
-            result = notify.send_bark_notification(self.config, level, f"Test {level}")
-            self.assertTrue(result)
+    def test_send_bark_notification_compact_success(self, bark_config, mock_bark_ok):
+        """Test that a successful Bark reply skips JSON parsing."""
+        mock_bark_ok.return_value.getresponse.return_value = _FakeResp(
+            body=b'{"code":200,"message":"success","timestamp":1700000000}'
+        )
 
-        self.assertEqual(mock_urlopen.call_count, 3)
+        with patch('json.loads') as mock_json_loads:
+            result = notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test message")
 
-    @patch('notify.urllib.request.urlopen')
-    @patch('builtins.print')
-    def test_send_bark_notification_unknown_level(self, mock_print, mock_urlopen):
-        """Test Bark notification with unknown level (should default to info)."""
-        mock_response = MagicMock()
-        mock_response.status = 200
-        mock_response.read.return_value = b'{"code": 200, "message": "success"}'
-        mock_urlopen.return_value.__enter__.return_value = mock_response
+        assert result
+        mock_json_loads.assert_not_called()
 
-        result = notify.send_bark_notification(self.config, "unknown", "Test message")
+    def test_send_bark_notification_unusual_layout(self, bark_config, mock_bark_ok):
+        """Test that a reply the byte scan cannot read falls back to JSON."""
+        mock_bark_ok.return_value.getresponse.return_value = _FakeResp(body=b'{"message": "success", "code" : 200}')
 
-        self.assertTrue(result)
+        assert notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test message")
 
+    def test_send_bark_notification_follows_redirect(self, bark_config, mock_bark_ok):
+        """Test that a redirecting Bark server is retried through urllib, which follows it."""
+        mock_bark_ok.return_value.getresponse.return_value = _FakeResp(301, "Moved Permanently", b"")
 
-class TestSystemNotification(unittest.TestCase):
-    """Test system notification functionality."""
+        with patch('notify._bark_urlopen', return_value=(200, "OK", b'{"code":200}')) as mock_urlopen:
+            result = notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test")
 
-    @patch('notify.platform.system')
-    @patch('notify._send_macos_notification')
-    @patch('builtins.print')
-    def test_send_system_notification_macos(self, mock_print, mock_send_macos, mock_system):
-        """Test system notification on macOS."""
-        mock_system.return_value = "Darwin"
-        mock_send_macos.return_value = True
+        assert result
+        url = mock_urlopen.call_args[0][0]
+        assert url.startswith("https://api.day.app/test_key_123/Test?")
 
-        result = notify.send_system_notification("success", "Test message")
+    def test_send_bark_notification_uses_proxy(self, bark_config):
+        """Test that a configured proxy sends the request through urllib instead of the pool."""
+        with patch.dict(os.environ, {"https_proxy": "http://proxy.example.com:3128", "no_proxy": ""}), \
+                patch('notify._get_connection') as mock_get_connection, \
+                patch('notify._bark_urlopen', return_value=(200, "OK", b'{"code":200}')) as mock_urlopen:
+            result = notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test")
 
-        self.assertTrue(result)
-        mock_send_macos.assert_called_once_with("✅ Task Completed", "Test message")
+        assert result
+        mock_get_connection.assert_not_called()
+        assert mock_urlopen.call_args[0][0].startswith("https://api.day.app/test_key_123/Test?")
 
-    @patch('notify.platform.system')
-    @patch('notify._send_linux_notification')
-    @patch('builtins.print')
-    def test_send_system_notification_linux(self, mock_print, mock_send_linux, mock_system):
-        """Test system notification on Linux."""
-        mock_system.return_value = "Linux"
-        mock_send_linux.return_value = True
+    def test_bark_proxy_bypassed(self):
+        """Test that no_proxy hosts and unset proxies use the pooled connection."""
+        with patch.dict(os.environ, {"https_proxy": "http://proxy.example.com:3128", "no_proxy": "api.day.app"}):
+            assert not notify._bark_proxy("https", "api.day.app")
+        env = {name: value for name, value in os.environ.items() if not name.lower().endswith("_proxy")}
+        with patch.dict(os.environ, env, clear=True), patch('notify._SYSTEM', "Linux"):
+            assert not notify._bark_proxy("https", "api.day.app")
 
-        result = notify.send_system_notification("error", "Test message")
+    def test_bark_urlopen_http_error(self):
+        """Test that urllib's HTTPError comes back as a status rather than an exception."""
+        error = urllib.error.HTTPError("https://api.day.app/x", 500, "Internal Server Error", {}, io.BytesIO(b"oops"))
+        with patch('urllib.request.urlopen', side_effect=error):
+            assert notify._bark_urlopen("https://api.day.app/x") == (500, "Internal Server Error", b"oops")
 
-        self.assertTrue(result)
-        mock_send_linux.assert_called_once_with("❌ Task Failed", "Test message")
+    def test_send_bark_notification_unusual_layout_error(self, bark_config, mock_bark_ok):
+        """Test that an error reply the byte scan cannot read is parsed only once."""
+        mock_bark_ok.return_value.getresponse.return_value = _FakeResp(body=b'{"message": "Bad Request", "code" : 400}')
 
-    @patch('notify.platform.system')
-    @patch('notify._send_windows_notification')
-    @patch('builtins.print')
-    def test_send_system_notification_windows(self, mock_print, mock_send_windows, mock_system):
-        """Test system notification on Windows."""
-        mock_system.return_value = "Windows"
-        mock_send_windows.return_value = True
+        with patch('json.loads', wraps=json.loads) as mock_json_loads:
+            result = notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.SUCCESS, "Test")
 
-        result = notify.send_system_notification("info", "Test message")
+        assert not result
+        mock_json_loads.assert_called_once()
 
-        self.assertTrue(result)
-        mock_send_windows.assert_called_once_with("ℹ️ Task Notification", "Test message")
+    def test_bark_code(self):
+        """Test reading the code field from raw Bark replies."""
+        assert notify._bark_code(b'{"code":200,"message":"success"}') == 200
+        assert notify._bark_code(b'{"code": 400, "message": "Bad Request"}') == 400
+        assert notify._bark_code(b'{"message":"ok","code":200}') == 200
+        assert notify._bark_code(b'{"message":"no code"}') is None
+        assert notify._bark_code(b'{"code":"200"}') is None
+        assert notify._bark_code(b'<html>Bad Gateway</html>') is None
+
+    @pytest.mark.parametrize("level", list(notify.Level))
+    def test_send_bark_notification_query_matches_urlencode(self, bark_config, mock_bark_ok, level):
+        """Test that the precomputed query string matches a full urlencode."""
+        bark_config["bark_group"] = "My Group/ü"
+
+        notify.send_bark_notification(notify._normalize_config(bark_config), level, "Test message")
+
+        expected = urllib.parse.urlencode({
+            "group": "My Group/ü",
+            "sound": notify.BARK_SOUNDS[level],
+            "level": notify.LEVEL_NAMES[level],
+            "icon": bark_config["icons"][notify.LEVEL_NAMES[level]]
+        })
+        assert _bark_path(mock_bark_ok).split("?", 1)[1] == expected
+
+    def test_send_bark_notification_server_path_prefix(self, bark_config, mock_bark_ok):
+        """Test that a path prefix in bark_server is kept in the request path."""
+        bark_config["bark_server"] = "http://bark.example.com/push/"
+
+        result = notify.send_bark_notification(notify._normalize_config(bark_config), notify.Level.INFO, "Test")
+
+        assert result
+        mock_bark_ok.assert_called_once_with("http", "bark.example.com")
+        assert _bark_path(mock_bark_ok).startswith("/push/test_key_123/Test?")
+
+
+class TestBarkConnectionPool(unittest.TestCase):
+    """Test pooled Bark connections."""
+
+    def tearDown(self):
+        """Clean up pooled connections."""
+        notify._close_connections()
+
+    def test_get_connection_reuses_connection(self):
+        """Test that the same server gets the same connection object."""
+        first = notify._get_connection("https", "api.day.app")
+        second = notify._get_connection("https", "api.day.app")
+
+        self.assertIs(first, second)
+        self.assertIsInstance(first, http.client.HTTPSConnection)
+
+    def test_get_connection_http_scheme(self):
+        """Test that plain http servers get an HTTPConnection."""
+        conn = notify._get_connection("http", "bark.local:8080")
+
+        self.assertNotIsInstance(conn, http.client.HTTPSConnection)
+        self.assertEqual(conn.port, 8080)
+
+    def test_close_connections(self):
+        """Test that pooled connections are closed and forgotten."""
+        conn = Mock()
+        notify._CONN_CACHE[("https", "api.day.app")] = conn
+
+        notify._close_connections()
+
+        conn.close.assert_called_once()
+        self.assertEqual(notify._CONN_CACHE, {})
+
+    def test_bark_get_error_drops_connection(self):
+        """Test that a failed request removes the connection from the pool."""
+        conn = Mock()
+        conn.request.side_effect = TimeoutError("Request timed out")
+        notify._CONN_CACHE[("https", "api.day.app")] = conn
+
+        with self.assertRaises(TimeoutError):
+            notify._bark_get("https", "api.day.app", "/key/msg")
+
+        conn.close.assert_called_once()
+        self.assertNotIn(("https", "api.day.app"), notify._CONN_CACHE)
+
+    @patch('http.client.HTTPSConnection')
+    def test_bark_get_retries_stale_connection(self, mock_https_connection):
+        """Test that a pooled connection closed by the server is retried once."""
+        stale = Mock()
+        stale.getresponse.side_effect = http.client.RemoteDisconnected("closed")
+        notify._CONN_CACHE[("https", "api.day.app")] = stale
+
+        mock_https_connection.return_value.getresponse.return_value = _FakeResp(body=b'{"code":200}')
+
+        result = notify._bark_get("https", "api.day.app", "/key/msg")
+
+        self.assertEqual(result, (200, "OK", b'{"code":200}'))
+        stale.close.assert_called_once()
+        mock_https_connection.assert_called_once_with("api.day.app", timeout=10)
+
+
+class TestPlatformDispatch:
+    """Test that each channel dispatches to the helper for the current OS."""
+
+    @pytest.mark.parametrize("system, level, title", [
+        ("Darwin", notify.Level.SUCCESS, "✅ Task Completed"),
+        ("Linux", notify.Level.ERROR, "❌ Task Failed"),
+        ("Windows", notify.Level.INFO, "ℹ️ Task Notification")
+    ])
+    def test_send_system_notification(self, system, level, title):
+        """Test system notification on each supported OS."""
+        mock_notifier = Mock(return_value=True)
+
+        with patch('notify._SYSTEM', system), patch.dict(notify._SYSTEM_NOTIFIERS, {system: mock_notifier}):
+            result = notify.send_system_notification(level, "Test message")
+
+        assert result
+        mock_notifier.assert_called_once_with(title, "Test message")
 
-    @patch('notify.platform.system')
+    @pytest.mark.parametrize("system, level", [
+        ("Darwin", notify.Level.SUCCESS),
+        ("Linux", notify.Level.ERROR),
+        ("Windows", notify.Level.INFO)
+    ])
+    def test_play_sound(self, system, level):
+        """Test sound playback on each supported OS."""
+        mock_player = Mock(return_value=True)
+
+        with patch('notify._SYSTEM', system), patch.dict(notify._SOUND_PLAYERS, {system: mock_player}):
+            result = notify.play_sound(level)
+
+        assert result
+        mock_player.assert_called_once_with(level)
+
+
+class TestSystemNotification(unittest.TestCase):
+    """Test system notification functionality."""
+
+    @patch('notify._SYSTEM', "FreeBSD")
     @patch('builtins.print')
-    def test_send_system_notification_unsupported_os(self, mock_print, mock_system):
+    def test_send_system_notification_unsupported_os(self, mock_print):
         """Test system notification on unsupported OS."""
-        mock_system.return_value = "FreeBSD"
-
-        result = notify.send_system_notification("success", "Test message")
+        result = notify.send_system_notification(notify.Level.SUCCESS, "Test message")
 
         self.assertFalse(result)
 
-    @patch('notify.subprocess.run')
+    @patch('subprocess.run')
     @patch('builtins.print')
     def test_send_macos_notification_success(self, mock_print, mock_run):
         """Test macOS notification success."""
-        mock_run.return_value = MagicMock()
+        mock_run.return_value = Mock(returncode=0)
 
         result = notify._send_macos_notification("Test Title", "Test message")
 
@@ -386,7 +517,7 @@ class TestSystemNotification(unittest.TestCase):
         call_args = mock_run.call_args
         self.assertEqual(call_args[0][0], ["osascript", "-e", 'display notification "Test message" with title "Test Title"'])
 
-    @patch('notify.subprocess.run')
+    @patch('subprocess.run')
     @patch('builtins.print')
     def test_send_macos_notification_failure(self, mock_print, mock_run):
         """Test macOS notification failure."""
@@ -396,11 +527,12 @@ class TestSystemNotification(unittest.TestCase):
 
         self.assertFalse(result)
 
-    @patch('notify.subprocess.run')
+    @patch('notify._load_libnotify', return_value=None)
+    @patch('subprocess.run')
     @patch('builtins.print')
-    def test_send_linux_notification_success(self, mock_print, mock_run):
+    def test_send_linux_notification_success(self, mock_print, mock_run, mock_load_libnotify):
         """Test Linux notification success."""
-        mock_run.return_value = MagicMock()
+        mock_run.return_value = Mock(returncode=0)
 
         result = notify._send_linux_notification("Test Title", "Test message")
 
@@ -412,9 +544,10 @@ class TestSystemNotification(unittest.TestCase):
             timeout=5
         )
 
-    @patch('notify.subprocess.run')
+    @patch('notify._load_libnotify', return_value=None)
+    @patch('subprocess.run')
     @patch('builtins.print')
-    def test_send_linux_notification_not_found(self, mock_print, mock_run):
+    def test_send_linux_notification_not_found(self, mock_print, mock_run, mock_load_libnotify):
         """Test Linux notification when notify-send is not found."""
         mock_run.side_effect = FileNotFoundError()
 
@@ -422,9 +555,10 @@ class TestSystemNotification(unittest.TestCase):
 
         self.assertFalse(result)
 
-    @patch('notify.subprocess.run')
+    @patch('notify._load_libnotify', return_value=None)
+    @patch('subprocess.run')
     @patch('builtins.print')
-    def test_send_linux_notification_failure(self, mock_print, mock_run):
+    def test_send_linux_notification_failure(self, mock_print, mock_run, mock_load_libnotify):
         """Test Linux notification failure."""
         error = subprocess.CalledProcessError(1, "notify-send")
         error.stderr = b"Error message"
@@ -434,21 +568,89 @@ class TestSystemNotification(unittest.TestCase):
 
         self.assertFalse(result)
 
-    @patch('notify.subprocess.run')
+    @patch('notify._load_libnotify')
+    @patch('subprocess.run')
     @patch('builtins.print')
-    def test_send_windows_notification_success(self, mock_print, mock_run):
+    def test_send_linux_notification_libnotify(self, mock_print, mock_run, mock_load_libnotify):
+        """Test Linux notification through libnotify skips notify-send."""
+        libnotify = mock_load_libnotify.return_value
+        libnotify.notify_notification_new.return_value = 1234
+        libnotify.notify_notification_show.return_value = 1
+
+        result = notify._send_linux_notification("Test Title", "Test message")
+
+        self.assertTrue(result)
+        libnotify.notify_notification_new.assert_called_once_with(b"Test Title", b"Test message", None)
+        libnotify.g_object_unref.assert_called_once_with(1234)
+        mock_run.assert_not_called()
+
+    @patch('notify._load_libnotify')
+    @patch('subprocess.run')
+    @patch('builtins.print')
+    def test_send_linux_notification_libnotify_fallback(self, mock_print, mock_run, mock_load_libnotify):
+        """Test Linux notification falls back to notify-send when libnotify fails."""
+        libnotify = mock_load_libnotify.return_value
+        libnotify.notify_notification_new.return_value = 1234
+        libnotify.notify_notification_show.return_value = 0
+        mock_run.return_value = Mock(returncode=0)
+
+        result = notify._send_linux_notification("Test Title", "Test message")
+
+        self.assertTrue(result)
+        mock_run.assert_called_once()
+
+    @patch('ctypes.CDLL', side_effect=OSError("libnotify.so.4: cannot open shared object file"))
+    def test_load_libnotify_unavailable(self, mock_cdll):
+        """Test that a missing libnotify is reported once and then cached."""
+        with patch('notify._LIBNOTIFY', None):
+            self.assertIsNone(notify._load_libnotify())
+            self.assertIsNone(notify._load_libnotify())
+
+        mock_cdll.assert_called_once_with("libnotify.so.4")
+
+    @patch('notify._powershell_file_command', return_value=["powershell", "-File", "toast.ps1"])
+    @patch('subprocess.run')
+    @patch('builtins.print')
+    def test_send_windows_notification_success(self, mock_print, mock_run, mock_ps_command):
         """Test Windows notification success."""
-        mock_run.return_value = MagicMock()
+        mock_run.return_value = Mock(returncode=0)
 
-        result = notify._send_windows_notification("Test Title", "Test message")
+        result = notify._send_windows_notification("Test Title", 'Say "hi" & <bye>')
 
         self.assertTrue(result)
         mock_run.assert_called_once()
         self.assertIn("powershell", mock_run.call_args[0][0])
+        # Title and message travel as arguments, not inside the script text
+        self.assertEqual(
+            mock_run.call_args[0][0][-4:],
+            ["-Title", "Test Title", "-Message", 'Say "hi" & <bye>']
+        )
+        mock_ps_command.assert_called_once_with("toast.ps1", notify._PS_TOAST_SCRIPT)
 
-    @patch('notify.subprocess.run')
+    def test_powershell_file_command_writes_script_once(self):
+        """Test that PowerShell scripts are written once and rewritten on change."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        script_path = os.path.join(temp_dir, "task-notifier", "toast.ps1")
+
+        with patch.dict(os.environ, {"LOCALAPPDATA": temp_dir}):
+            cmd = notify._powershell_file_command("toast.ps1", "param($Title)\n")
+            self.assertEqual(cmd[-2:], ["-File", script_path])
+            self.assertIn("-NoProfile", cmd)
+
+            with patch('notify.os.replace') as mock_replace:
+                notify._powershell_file_command("toast.ps1", "param($Title)\n")
+                mock_replace.assert_not_called()
+
+            notify._powershell_file_command("toast.ps1", "param($Title, $Message)\n")
+
+        with open(script_path) as f:
+            self.assertEqual(f.read(), "param($Title, $Message)\n")
+
+    @patch('notify._powershell_file_command', return_value=["powershell", "-File", "toast.ps1"])
+    @patch('subprocess.run')
     @patch('builtins.print')
-    def test_send_windows_notification_failure(self, mock_print, mock_run):
+    def test_send_windows_notification_failure(self, mock_print, mock_run, mock_ps_command):
         """Test Windows notification failure."""
         error = subprocess.CalledProcessError(1, "powershell")
         error.stderr = b"Error message"
@@ -462,315 +664,632 @@ class TestSystemNotification(unittest.TestCase):
 class TestSoundNotification(unittest.TestCase):
     """Test sound notification functionality."""
 
-    @patch('notify.platform.system')
-    @patch('notify._play_macos_sound')
-    @patch('builtins.print')
-    def test_play_sound_macos(self, mock_print, mock_play_macos, mock_system):
-        """Test sound playback on macOS."""
-        mock_system.return_value = "Darwin"
-        mock_play_macos.return_value = True
+    def setUp(self):
+        """Isolate the Linux sound cache in a temp directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.sound_cache_path = os.path.join(self.temp_dir, "sound.txt")
+        for patcher in [
+            patch('notify.LINUX_SOUND_CACHE_PATH', self.sound_cache_path),
+            patch('notify._LINUX_SOUND_CACHE', None)
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
 
-        result = notify.play_sound("success")
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
 
-        self.assertTrue(result)
-        mock_play_macos.assert_called_once_with("success")
+    @patch('notify._SYSTEM', "FreeBSD")
+    @patch('builtins.print')
+    def test_play_sound_unsupported_os(self, mock_print):
+        """Test sound playback on unsupported OS."""
+        result = notify.play_sound(notify.Level.SUCCESS)
+
+        self.assertFalse(result)
 
-    @patch('notify.platform.system')
-    @patch('notify._play_linux_sound')
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_sound_linux(self, mock_print, mock_play_linux, mock_system):
-        """Test sound playback on Linux."""
-        mock_system.return_value = "Linux"
-        mock_play_linux.return_value = True
+    def test_play_macos_sound_success(self, mock_print, mock_popen):
+        """Test macOS sound playback success."""
+        mock_popen.return_value = Mock()
 
-        result = notify.play_sound("error")
+        result = notify._play_macos_sound(notify.Level.SUCCESS)
 
         self.assertTrue(result)
-        mock_play_linux.assert_called_once_with("error")
+        mock_popen.assert_called_once()
+        self.assertIn("afplay", mock_popen.call_args[0][0])
 
-    @patch('notify.platform.system')
-    @patch('notify._play_windows_sound')
+    @patch('notify.os.path.exists')
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_sound_windows(self, mock_print, mock_play_windows, mock_system):
-        """Test sound playback on Windows."""
-        mock_system.return_value = "Windows"
-        mock_play_windows.return_value = True
-
-        result = notify.play_sound("info")
+    def test_play_macos_sound_not_found(self, mock_print, mock_popen, mock_exists):
+        """Test macOS sound is dispatched without checking the file first."""
+        result = notify._play_macos_sound(notify.Level.SUCCESS)
 
         self.assertTrue(result)
-        mock_play_windows.assert_called_once_with("info")
+        mock_popen.assert_called_once()
+        mock_exists.assert_not_called()
 
-    @patch('notify.platform.system')
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_sound_unsupported_os(self, mock_print, mock_system):
-        """Test sound playback on unsupported OS."""
-        mock_system.return_value = "FreeBSD"
+    def test_play_macos_sound_failure(self, mock_print, mock_popen):
+        """Test macOS sound playback failure (afplay missing)."""
+        mock_popen.side_effect = FileNotFoundError("afplay")
 
-        result = notify.play_sound("success")
+        result = notify._play_macos_sound(notify.Level.SUCCESS)
 
         self.assertFalse(result)
 
     @patch('notify.os.path.exists')
-    @patch('notify.subprocess.run')
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_macos_sound_success(self, mock_print, mock_run, mock_exists):
-        """Test macOS sound playback success."""
-        mock_exists.return_value = True
-        mock_run.return_value = MagicMock()
+    def test_play_linux_sound_success(self, mock_print, mock_popen, mock_exists):
+        """Test Linux sound playback success."""
+        # First sound file exists, paplay succeeds
+        mock_exists.side_effect = lambda x: "/freedesktop/" in x
+        mock_popen.return_value = Mock(**{"wait.return_value": 0})
 
-        result = notify._play_macos_sound("success")
+        result = notify._play_linux_sound(notify.Level.SUCCESS)
 
         self.assertTrue(result)
-        mock_run.assert_called_once()
-        self.assertIn("afplay", mock_run.call_args[0][0])
 
     @patch('notify.os.path.exists')
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_macos_sound_not_found(self, mock_print, mock_exists):
-        """Test macOS sound when file not found."""
+    def test_play_linux_sound_no_files(self, mock_print, mock_popen, mock_exists):
+        """Test Linux sound when no sound files found."""
         mock_exists.return_value = False
 
-        result = notify._play_macos_sound("success")
+        result = notify._play_linux_sound(notify.Level.SUCCESS)
 
         self.assertFalse(result)
 
     @patch('notify.os.path.exists')
-    @patch('notify.subprocess.run')
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_macos_sound_failure(self, mock_print, mock_run, mock_exists):
-        """Test macOS sound playback failure."""
-        mock_exists.return_value = True
-        mock_run.side_effect = subprocess.CalledProcessError(1, "afplay")
+    def test_play_linux_sound_persists_probe(self, mock_print, mock_popen, mock_exists):
+        """Test that the first working command/file pair is written to the cache."""
+        mock_exists.side_effect = lambda x: x.endswith("message.oga")
+        mock_popen.return_value = Mock(**{"wait.return_value": 0})
 
-        result = notify._play_macos_sound("success")
+        notify._play_linux_sound(notify.Level.SUCCESS)
 
-        self.assertFalse(result)
+        with open(self.sound_cache_path) as f:
+            self.assertEqual(
+                f.read().splitlines(),
+                ["paplay", "/usr/share/sounds/freedesktop/stereo/message.oga"]
+            )
 
     @patch('notify.os.path.exists')
-    @patch('notify.subprocess.run')
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_linux_sound_success(self, mock_print, mock_run, mock_exists):
-        """Test Linux sound playback success."""
-        # First sound file exists, paplay succeeds
-        mock_exists.side_effect = lambda x: "/freedesktop/" in x
-        mock_run.return_value = MagicMock()
+    def test_play_linux_sound_failing_player_not_cached(self, mock_print, mock_popen, mock_exists):
+        """Test that a player exiting with an error is skipped and never cached."""
+        mock_exists.side_effect = lambda x: x.endswith("complete.oga")
+        mock_popen.side_effect = [Mock(**{"wait.return_value": 1}), Mock(**{"wait.return_value": 0})]
 
-        result = notify._play_linux_sound("success")
+        result = notify._play_linux_sound(notify.Level.SUCCESS)
 
         self.assertTrue(result)
+        self.assertEqual(mock_popen.call_args[0][0][0], "aplay")
+        with open(self.sound_cache_path) as f:
+            self.assertEqual(f.read().splitlines()[0], "aplay")
 
     @patch('notify.os.path.exists')
-    @patch('notify.subprocess.run')
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_linux_sound_no_files(self, mock_print, mock_run, mock_exists):
-        """Test Linux sound when no sound files found."""
-        mock_exists.return_value = False
+    def test_play_linux_sound_still_playing(self, mock_print, mock_popen, mock_exists):
+        """Test that a player still running after the grace period counts as working."""
+        mock_exists.side_effect = lambda x: x.endswith("complete.oga")
+        mock_popen.return_value.wait.side_effect = subprocess.TimeoutExpired("paplay", 0.2)
 
-        result = notify._play_linux_sound("success")
+        self.assertTrue(notify._play_linux_sound(notify.Level.SUCCESS))
+        self.assertEqual(notify._LINUX_SOUND_CACHE[0], "paplay")
 
-        self.assertFalse(result)
+    @patch('notify.os.path.exists')
+    @patch('subprocess.Popen')
+    @patch('builtins.print')
+    def test_play_linux_sound_uses_cache(self, mock_print, mock_popen, mock_exists):
+        """Test that a cached pair is played without probing."""
+        with open(self.sound_cache_path, 'w') as f:
+            f.write("aplay\n/tmp/cached.oga\n")
+        mock_exists.return_value = True
+
+        result = notify._play_linux_sound(notify.Level.SUCCESS)
+
+        self.assertTrue(result)
+        mock_exists.assert_called_once_with("/tmp/cached.oga")
+        self.assertEqual(mock_popen.call_args[0][0], ["aplay", "/tmp/cached.oga"])
+
+    @patch('notify.os.path.exists')
+    @patch('subprocess.Popen')
+    @patch('builtins.print')
+    def test_play_linux_sound_stale_cache(self, mock_print, mock_popen, mock_exists):
+        """Test that a cached pair that fails to start is dropped and the probe reruns."""
+        with open(self.sound_cache_path, 'w') as f:
+            f.write("missing-player\n/tmp/cached.oga\n")
+        mock_exists.side_effect = lambda x: x.endswith(("complete.oga", "cached.oga"))
+        mock_popen.side_effect = [FileNotFoundError(), Mock(**{"wait.return_value": 0})]
+
+        result = notify._play_linux_sound(notify.Level.SUCCESS)
+
+        self.assertTrue(result)
+        self.assertEqual(mock_popen.call_args[0][0][0], "paplay")
+        self.assertEqual(notify._LINUX_SOUND_CACHE[0], "paplay")
 
-    @patch('notify.subprocess.run')
+    @patch('notify._powershell_file_command', return_value=["powershell", "-File", "sound.ps1"])
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_windows_sound_success(self, mock_print, mock_run):
+    def test_play_windows_sound_success(self, mock_print, mock_popen, mock_ps_command):
         """Test Windows sound playback success."""
-        mock_run.return_value = MagicMock()
+        mock_popen.return_value = Mock()
 
-        result = notify._play_windows_sound("error")
+        result = notify._play_windows_sound(notify.Level.ERROR)
 
         self.assertTrue(result)
-        mock_run.assert_called_once()
-        self.assertIn("powershell", mock_run.call_args[0][0])
+        mock_popen.assert_called_once()
+        self.assertIn("powershell", mock_popen.call_args[0][0])
+        self.assertEqual(mock_popen.call_args[0][0][-2:], ["-Name", "Hand"])
+
+    @patch('subprocess.Popen')
+    def test_spawn_detached(self, mock_popen):
+        """Test that sound players are started detached with output discarded."""
+        notify._spawn_detached(["afplay", "/tmp/sound.aiff"])
+
+        mock_popen.assert_called_once_with(
+            ["afplay", "/tmp/sound.aiff"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True
+        )
 
-    @patch('notify.subprocess.run')
+    @patch('notify._powershell_file_command', return_value=["powershell", "-File", "sound.ps1"])
+    @patch('subprocess.Popen')
     @patch('builtins.print')
-    def test_play_windows_sound_failure(self, mock_print, mock_run):
+    def test_play_windows_sound_failure(self, mock_print, mock_popen, mock_ps_command):
         """Test Windows sound playback failure."""
-        mock_run.side_effect = subprocess.CalledProcessError(1, "powershell")
+        mock_popen.side_effect = FileNotFoundError("powershell")
 
-        result = notify._play_windows_sound("success")
+        result = notify._play_windows_sound(notify.Level.SUCCESS)
 
         self.assertFalse(result)
 
 
-class TestMainFunction(unittest.TestCase):
+class TestWriteAtomic(unittest.TestCase):
+    """Test atomic file writes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+
+    def test_write_atomic_creates_parent(self):
+        """Test that the file and its missing parent directory are created."""
+        path = os.path.join(self.temp_dir, "sub", "state")
+
+        notify._write_atomic(path, b"data")
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), b"data")
+        self.assertEqual(os.listdir(os.path.dirname(path)), ["state"])
+
+    def test_write_atomic_failure_removes_tmp(self):
+        """Test that a failed write re-raises and leaves no temporary file behind."""
+        path = os.path.join(self.temp_dir, "state")
+
+        with patch('notify.os.replace', side_effect=PermissionError("Access denied")):
+            with self.assertRaises(PermissionError):
+                notify._write_atomic(path, b"data")
+
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+
+class TestDeduplication(unittest.TestCase):
+    """Test suppression of repeated notifications."""
+
+    def setUp(self):
+        """Isolate the dedupe record in a temp directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = patch('notify.DEDUPE_PATH', os.path.join(self.temp_dir, "cache", "dedupe"))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        """Clean up test fixtures."""
+        shutil.rmtree(self.temp_dir)
+
+    def test_first_notification_is_not_duplicate(self):
+        """Test that a new notification is sent and recorded."""
+        self.assertFalse(notify._is_duplicate(notify.Level.SUCCESS, "Build done", 5))
+        with open(notify.DEDUPE_PATH, 'rb') as f:
+            self.assertEqual(len(f.read()), 24)
+
+    def test_repeat_within_window_is_duplicate(self):
+        """Test that the same notification inside the window is suppressed."""
+        notify._is_duplicate(notify.Level.SUCCESS, "Build done", 5)
+
+        self.assertTrue(notify._is_duplicate(notify.Level.SUCCESS, "Build done", 5))
+
+    def test_different_notification_is_not_duplicate(self):
+        """Test that a different level or message is not suppressed."""
+        notify._is_duplicate(notify.Level.SUCCESS, "Build done", 5)
+
+        self.assertFalse(notify._is_duplicate(notify.Level.ERROR, "Build done", 5))
+        self.assertFalse(notify._is_duplicate(notify.Level.ERROR, "Build failed", 5))
+
+    def test_repeat_after_window_is_not_duplicate(self):
+        """Test that the same notification after the window is sent again."""
+        with patch('time.time', return_value=1000.0):
+            notify._is_duplicate(notify.Level.SUCCESS, "Build done", 5)
+        with patch('time.time', return_value=1006.0):
+            self.assertFalse(notify._is_duplicate(notify.Level.SUCCESS, "Build done", 5))
+
+
+@pytest.fixture(scope="class")
+def main_patches(tmp_path_factory):
+    """Patch main()'s collaborators once for the whole TestMainFunction class."""
+    state_dir = tmp_path_factory.mktemp("main")
+    with ExitStack() as stack:
+        mocks = types.SimpleNamespace(
+            load_config=stack.enter_context(patch('notify.load_config')),
+            bark=stack.enter_context(patch('notify.send_bark_notification')),
+            system_notify=stack.enter_context(patch('notify.send_system_notification')),
+            play_sound=stack.enter_context(patch('notify.play_sound')),
+            send_to_daemon=stack.enter_context(patch('notify._send_to_daemon')),
+            run_daemon=stack.enter_context(patch('notify.run_daemon'))
+        )
+        stack.enter_context(patch('notify.DEDUPE_PATH', str(state_dir / "dedupe")))
+        yield mocks
+
+
+@pytest.fixture
+def notify_mocks(main_patches):
+    """Reset the shared main() mocks and the dedupe record before each test."""
+    for mock in vars(main_patches).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    main_patches.load_config.return_value = notify._normalize_config({"bark_key": "test_key"})
+    main_patches.bark.return_value = True
+    main_patches.system_notify.return_value = True
+    main_patches.play_sound.return_value = True
+    # No daemon, so main() always takes the in-process path
+    main_patches.send_to_daemon.return_value = False
+    if os.path.exists(notify.DEDUPE_PATH):
+        os.remove(notify.DEDUPE_PATH)
+    return main_patches
+
+
+# main() reads sys.argv, so keep these tests together in one xdist worker
+@pytest.mark.xdist_group(name="argv")
+class TestMainFunction:
     """Test main entry point."""
 
-    @patch('sys.argv', ['notify.py'])
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_main_no_arguments(self, mock_stderr):
+    @pytest.fixture(autouse=True)
+    def _argv(self, monkeypatch):
+        """Default command line; tests needing another one set sys.argv themselves."""
+        monkeypatch.setattr(sys, "argv", ['notify.py', 'success', 'Test message'])
+
+    def test_main_no_arguments(self, notify_mocks, monkeypatch, capsys):
         """Test main with no arguments."""
-        with self.assertRaises(SystemExit) as context:
+        monkeypatch.setattr(sys, "argv", ['notify.py'])
+
+        with pytest.raises(SystemExit) as context:
             notify.main()
-        self.assertEqual(context.exception.code, 1)
 
-    @patch('sys.argv', ['notify.py', 'invalid_level', 'test'])
-    @patch('notify.load_config')
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_main_invalid_level(self, mock_stderr, mock_load_config):
+        assert context.value.code == 1
+        assert capsys.readouterr().err == notify._USAGE
+
+    def test_main_invalid_level(self, notify_mocks, monkeypatch):
         """Test main with invalid level."""
-        mock_load_config.return_value = {}
+        monkeypatch.setattr(sys, "argv", ['notify.py', 'invalid_level', 'test'])
 
-        with self.assertRaises(SystemExit) as context:
+        with pytest.raises(SystemExit) as context:
             notify.main()
-        self.assertEqual(context.exception.code, 1)
-
-    @patch('sys.argv', ['notify.py', 'success', 'Test message'])
-    @patch('notify.load_config')
-    @patch('notify.send_bark_notification')
-    @patch('notify.send_system_notification')
-    @patch('notify.play_sound')
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_main_success_all_channels(self, mock_stderr, mock_play_sound, mock_system_notify, mock_bark, mock_load_config):
-        """Test main with success and all channels enabled."""
-        mock_load_config.return_value = {
-            "bark_key": "test_key",
-            "sound_enabled": True,
-            "system_notify_enabled": True
-        }
-        mock_bark.return_value = True
-        mock_system_notify.return_value = True
-        mock_play_sound.return_value = True
 
+        assert context.value.code == 1
+        notify_mocks.load_config.assert_not_called()
+
+    def test_main_success_all_channels(self, notify_mocks):
+        """Test main with success and all channels enabled."""
         notify.main()
 
-        mock_bark.assert_called_once()
-        mock_system_notify.assert_called_once()
-        mock_play_sound.assert_called_once()
-
-    @patch('sys.argv', ['notify.py', 'error', 'Error message'])
-    @patch('notify.load_config')
-    @patch('notify.send_bark_notification')
-    @patch('notify.send_system_notification')
-    @patch('notify.play_sound')
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_main_error_level(self, mock_stderr, mock_play_sound, mock_system_notify, mock_bark, mock_load_config):
+        notify_mocks.bark.assert_called_once()
+        notify_mocks.system_notify.assert_called_once()
+        notify_mocks.play_sound.assert_called_once()
+
+    def test_main_error_level(self, notify_mocks, monkeypatch):
         """Test main with error level."""
-        mock_load_config.return_value = {
-            "bark_key": "test_key",
-            "sound_enabled": True,
-            "system_notify_enabled": True
-        }
-        mock_bark.return_value = True
-        mock_system_notify.return_value = True
-        mock_play_sound.return_value = True
+        monkeypatch.setattr(sys, "argv", ['notify.py', 'error', 'Error message'])
 
         notify.main()
 
-        mock_bark.assert_called_once_with(
-            mock_load_config.return_value, "error", "Error message"
+        notify_mocks.bark.assert_called_once_with(
+            notify_mocks.load_config.return_value, notify.Level.ERROR, "Error message"
         )
+        notify_mocks.system_notify.assert_called_once_with(notify.Level.ERROR, "Error message")
+        notify_mocks.play_sound.assert_called_once_with(notify.Level.ERROR)
 
-    @patch('sys.argv', ['notify.py', 'info', 'Info message'])
-    @patch('notify.load_config')
-    @patch('notify.send_bark_notification')
-    @patch('notify.send_system_notification')
-    @patch('notify.play_sound')
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_main_info_level(self, mock_stderr, mock_play_sound, mock_system_notify, mock_bark, mock_load_config):
+    def test_main_info_level(self, notify_mocks, monkeypatch):
         """Test main with info level."""
-        mock_load_config.return_value = {
-            "bark_key": "test_key",
-            "sound_enabled": True,
-            "system_notify_enabled": True
-        }
-        mock_bark.return_value = True
-        mock_system_notify.return_value = True
-        mock_play_sound.return_value = True
+        monkeypatch.setattr(sys, "argv", ['notify.py', 'info', 'Info message'])
 
         notify.main()
 
-        mock_bark.assert_called_once()
+        notify_mocks.bark.assert_called_once()
 
-    @patch('sys.argv', ['notify.py', 'success', 'Test message'])
-    @patch('notify.load_config')
-    @patch('notify.send_bark_notification')
-    @patch('notify.send_system_notification')
-    @patch('notify.play_sound')
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_main_sound_disabled(self, mock_stderr, mock_play_sound, mock_system_notify, mock_bark, mock_load_config):
+    def test_main_sound_disabled(self, notify_mocks):
         """Test main with sound disabled."""
-        mock_load_config.return_value = {
+        notify_mocks.load_config.return_value = notify._normalize_config({
             "bark_key": "test_key",
-            "sound_enabled": False,
-            "system_notify_enabled": True
-        }
-        mock_bark.return_value = True
-        mock_system_notify.return_value = True
+            "sound_enabled": False
+        })
 
         notify.main()
 
-        mock_bark.assert_called_once()
-        mock_system_notify.assert_called_once()
-        mock_play_sound.assert_not_called()
-
-    @patch('sys.argv', ['notify.py', 'success', 'Test message'])
-    @patch('notify.load_config')
-    @patch('notify.send_bark_notification')
-    @patch('notify.send_system_notification')
-    @patch('notify.play_sound')
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_main_system_notify_disabled(self, mock_stderr, mock_play_sound, mock_system_notify, mock_bark, mock_load_config):
+        notify_mocks.bark.assert_called_once()
+        notify_mocks.system_notify.assert_called_once()
+        notify_mocks.play_sound.assert_not_called()
+
+    def test_main_system_notify_disabled(self, notify_mocks):
         """Test main with system notification disabled."""
-        mock_load_config.return_value = {
+        notify_mocks.load_config.return_value = notify._normalize_config({
             "bark_key": "test_key",
-            "sound_enabled": True,
             "system_notify_enabled": False
-        }
-        mock_bark.return_value = True
-        mock_play_sound.return_value = True
+        })
 
         notify.main()
 
-        mock_bark.assert_called_once()
-        mock_play_sound.assert_called_once()
-        mock_system_notify.assert_not_called()
-
-    @patch('sys.argv', ['notify.py', 'success', 'Test message'])
-    @patch('notify.load_config')
-    @patch('notify.send_bark_notification')
-    @patch('notify.send_system_notification')
-    @patch('notify.play_sound')
-    @patch('sys.stderr', new_callable=MagicMock)
-    def test_main_all_channels_failed(self, mock_stderr, mock_play_sound, mock_system_notify, mock_bark, mock_load_config):
+        notify_mocks.bark.assert_called_once()
+        notify_mocks.play_sound.assert_called_once()
+        notify_mocks.system_notify.assert_not_called()
+
+    def test_main_all_channels_failed(self, notify_mocks, capsys):
         """Test main when all channels fail."""
-        mock_load_config.return_value = {
-            "bark_key": "test_key",
-            "sound_enabled": True,
-            "system_notify_enabled": True
-        }
-        mock_bark.return_value = False
-        mock_system_notify.return_value = False
-        mock_play_sound.return_value = False
+        notify_mocks.bark.return_value = False
+        notify_mocks.system_notify.return_value = False
+        notify_mocks.play_sound.return_value = False
 
         notify.main()
 
         # Should still call all channels even if they fail
-        mock_bark.assert_called_once()
-        mock_system_notify.assert_called_once()
-        mock_play_sound.assert_called_once()
+        notify_mocks.bark.assert_called_once()
+        notify_mocks.system_notify.assert_called_once()
+        notify_mocks.play_sound.assert_called_once()
+        assert "[SUMMARY] Notification complete: 0/3 channels succeeded" in capsys.readouterr().out
+
+    def test_main_disabled_by_env(self, notify_mocks, monkeypatch):
+        """Test that TASK_NOTIFIER_DISABLE exits before loading config."""
+        monkeypatch.setenv("TASK_NOTIFIER_DISABLE", "1")
+
+        with pytest.raises(SystemExit) as context:
+            notify.main()
+
+        assert context.value.code == 0
+        notify_mocks.load_config.assert_not_called()
+        notify_mocks.bark.assert_not_called()
+
+    def test_main_empty_bark_key_not_submitted(self, notify_mocks, capsys):
+        """Test that Bark is not dispatched at all without a key."""
+        notify_mocks.load_config.return_value = notify._normalize_config({"bark_key": ""})
+
+        notify.main()
+
+        notify_mocks.bark.assert_not_called()
+        assert "[SUMMARY] Notification complete: 2/3 channels succeeded" in capsys.readouterr().out
+
+    def test_main_all_channels_disabled(self, notify_mocks):
+        """Test that main returns early when no channel is enabled."""
+        notify_mocks.load_config.return_value = notify._normalize_config({
+            "bark_key": "",
+            "sound_enabled": False,
+            "system_notify_enabled": False
+        })
+
+        with patch('notify._is_duplicate') as mock_is_duplicate:
+            notify.main()
+
+        mock_is_duplicate.assert_not_called()
+        notify_mocks.system_notify.assert_not_called()
+        notify_mocks.play_sound.assert_not_called()
+
+    def test_main_duplicate_skipped(self, notify_mocks, capsys):
+        """Test that an identical notification right after another is skipped."""
+        notify.main()
+        notify.main()
+
+        assert "[DEDUP] Same notification sent in the last 5s, skipping" in capsys.readouterr().out
+
+        notify_mocks.bark.assert_called_once()
+        notify_mocks.system_notify.assert_called_once()
+        notify_mocks.play_sound.assert_called_once()
+
+    def test_main_dedupe_disabled(self, notify_mocks):
+        """Test that dedupe_window_sec = 0 sends every notification."""
+        notify_mocks.load_config.return_value = notify._normalize_config({"bark_key": "test_key", "dedupe_window_sec": 0})
+
+        notify.main()
+        notify.main()
+
+        assert notify_mocks.bark.call_count == 2
+        assert not os.path.exists(notify.DEDUPE_PATH)
+
+    def test_main_channels_run_concurrently(self, notify_mocks, capsys):
+        """Test that all channels are in flight at the same time."""
+        # Each channel waits for the other two; sequential dispatch would time out
+        barrier = threading.Barrier(3, timeout=5)
+        notify_mocks.bark.side_effect = lambda *args: barrier.wait() is not None
+        notify_mocks.system_notify.side_effect = lambda *args: barrier.wait() is not None
+        notify_mocks.play_sound.side_effect = lambda *args: barrier.wait() is not None
+
+        notify.main()
+
+        assert "[SUMMARY] Notification complete: 3/3 channels succeeded" in capsys.readouterr().out
+
+    def test_main_hands_off_to_daemon(self, notify_mocks, monkeypatch, capsys):
+        """Test that a running daemon takes the notification instead of main()."""
+        monkeypatch.setattr(sys, "argv", ['notify.py', 'error', 'Test message'])
+        notify_mocks.send_to_daemon.return_value = True
+
+        notify.main()
+
+        notify_mocks.send_to_daemon.assert_called_once_with(notify.Level.ERROR, "Test message")
+        notify_mocks.load_config.assert_not_called()
+        assert capsys.readouterr().out == "[OK]    Notification handed to daemon\n"
+
+    def test_main_daemon_flag(self, notify_mocks, monkeypatch):
+        """Test that --daemon starts the daemon."""
+        monkeypatch.setattr(sys, "argv", ['notify.py', '--daemon'])
+
+        notify.main()
+
+        notify_mocks.run_daemon.assert_called_once_with()
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "Unix domain sockets not available")
+class TestDaemon(unittest.TestCase):
+    """Test the daemon client and request handling."""
+
+    def setUp(self):
+        """Serve _handle_daemon_request on a socket in a temp directory."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.socket_path = os.path.join(self.temp_dir, "task-notifier.sock")
+        # Patches are started here rather than as decorators so they stay in
+        # place until the cleanups below have stopped the daemon's worker
+        self.mock_load_config = Mock(return_value=notify._normalize_config({"bark_key": "test_key"}))
+        self.mock_dispatch = Mock()
+        for patcher in [
+            patch('notify.SOCKET_PATH', self.socket_path),
+            patch('notify.DEDUPE_PATH', os.path.join(self.temp_dir, "dedupe")),
+            patch('notify.load_config', self.mock_load_config),
+            patch('notify.dispatch', self.mock_dispatch)
+        ]:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _start_server(self):
+        server = notify._create_daemon_server(self.socket_path, notify._normalize_config({"bark_key": "test_key"}))
+        thread = threading.Thread(target=server.serve_forever)
+        thread.start()
+        self.addCleanup(server.worker.join)
+        self.addCleanup(server.queue.put, None)
+        self.addCleanup(server.server_close)
+        self.addCleanup(thread.join)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def _wait_for_dispatches(self, count):
+        deadline = time.monotonic() + 5
+        while self.mock_dispatch.call_count < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.mock_dispatch.call_count, count)
+
+    def test_no_socket(self):
+        """Test that the client reports no daemon when the socket is missing."""
+        self.assertFalse(notify._send_to_daemon(notify.Level.SUCCESS, "Test message"))
+
+    def test_stale_socket(self):
+        """Test that a socket file nobody listens on is treated as no daemon."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.bind(self.socket_path)
+        sock.close()
+
+        self.assertFalse(notify._send_to_daemon(notify.Level.SUCCESS, "Test message"))
+
+    def test_socket_owner_only(self):
+        """Test that the daemon socket is created accessible to its owner only."""
+        self._start_server()
+
+        self.assertEqual(os.stat(self.socket_path).st_mode & 0o077, 0)
+
+    def test_daemon_dispatches(self):
+        """Test that the daemon acknowledges and dispatches the notification."""
+        config = notify._normalize_config({"bark_key": "new_key"})
+        self.mock_load_config.return_value = config
+        self._start_server()
+
+        self.assertTrue(notify._send_to_daemon(notify.Level.ERROR, "Line one\nLine two"))
+
+        self._wait_for_dispatches(1)
+        self.mock_dispatch.assert_called_once_with(config, notify.Level.ERROR, "Line one\nLine two")
+
+    def test_daemon_keeps_config_on_error(self):
+        """Test that a broken config.json leaves the daemon on its last good config."""
+        self.mock_load_config.side_effect = SystemExit(1)
+        self._start_server()
+
+        self.assertTrue(notify._send_to_daemon(notify.Level.INFO, "Test message"))
+
+        self._wait_for_dispatches(1)
+        self.assertEqual(self.mock_dispatch.call_args[0][0].bark_key, "test_key")
+
+    def test_slow_dispatch_does_not_block_clients(self):
+        """Test that clients are acknowledged while an earlier notification is still sending."""
+        release = threading.Event()
+        self.mock_dispatch.side_effect = lambda *args: release.wait(5)
+        self._start_server()
+        self.addCleanup(release.set)
+
+        start = time.monotonic()
+        self.assertTrue(notify._send_to_daemon(notify.Level.SUCCESS, "First"))
+        self.assertTrue(notify._send_to_daemon(notify.Level.ERROR, "Second"))
+        self.assertLess(time.monotonic() - start, 1)
+
+        release.set()
+        self._wait_for_dispatches(2)
+        self.assertEqual([c[0][2] for c in self.mock_dispatch.call_args_list], ["First", "Second"])
+
+    def test_stuck_client_does_not_block_others(self):
+        """Test that a client that never finishes its message leaves the daemon responsive."""
+        self._start_server()
+
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stuck:
+            stuck.connect(self.socket_path)
+            stuck.sendall(b"success\0partial")
+
+            self.assertTrue(notify._send_to_daemon(notify.Level.INFO, "Test message"))
+            self._wait_for_dispatches(1)
+
+        self.mock_dispatch.assert_called_once_with(self.mock_load_config.return_value, notify.Level.INFO, "Test message")
+
+
+class TestStartup(unittest.TestCase):
+    """Test import-time behaviour."""
+
+    @unittest.skipUnless(sys.platform in ("darwin", "linux", "win32"), "_SYSTEM is the raw sys.platform here")
+    def test_system_matches_platform(self):
+        """Test that _SYSTEM agrees with platform.system() on the supported OSes."""
+        import platform
+        self.assertEqual(notify._SYSTEM, platform.system())
+
+    def test_import_defers_channel_modules(self):
+        """Test that importing notify does not pull in per-channel modules."""
+        script = (
+            "import sys, notify; "
+            "print([m for m in ('subprocess', 'platform', 'http.client', 'ctypes', 'json', 'pathlib', 'concurrent.futures', 'logging', 'pickle') if m in sys.modules])"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=str(Path(__file__).parent.parent / "scripts"),
+            check=True,
+            capture_output=True,
+            text=True
+        )
+        self.assertEqual(result.stdout.strip(), "[]")
 
 
 class TestConstants(unittest.TestCase):
     """Test constant definitions."""
 
-    def test_bark_config_has_all_levels(self):
-        """Test that BARK_CONFIG has all required levels."""
-        required_levels = ["success", "error", "info"]
-        for level in required_levels:
-            self.assertIn(level, notify.BARK_CONFIG)
-            self.assertIn("group", notify.BARK_CONFIG[level])
-            self.assertIn("icon", notify.BARK_CONFIG[level])
-            self.assertIn("sound", notify.BARK_CONFIG[level])
-
-    def test_sound_map_has_all_levels(self):
-        """Test that SOUND_MAP has all required levels."""
-        required_levels = ["success", "error", "info"]
-        for level in required_levels:
-            self.assertIn(level, notify.SOUND_MAP)
-
-
-if __name__ == "__main__":
-    # Run tests with verbose output
-    unittest.main(verbosity=2)
+    def test_level_names_match_enum(self):
+        """Test that LEVEL_NAMES lines up with the Level enum."""
+        self.assertEqual(notify.LEVEL_NAMES, ("success", "error", "info"))
+        for level in notify.Level:
+            self.assertEqual(notify.LEVEL_NAMES[level], level.name.lower())
+
+    def test_per_level_tuples_cover_all_levels(self):
+        """Test that every per-level tuple has one entry per level."""
+        for table in [notify.BARK_ICONS, notify.BARK_SOUNDS, notify._BARK_QS,
+                      notify.TITLES, notify.MACOS_SOUNDS, notify.WINDOWS_SOUNDS]:
+            self.assertEqual(len(table), len(notify.Level))
+